@@ -2,17 +2,53 @@
 """
 IndigoGlass Nexus - Synthetic Data Generator
 Generates realistic supply chain data for development and testing.
+
+The row loops are plain Python, so the script also runs under PyPy
+(``pypy3 generate.py --days 90``), where the pure-Python kernels are
+selected automatically.
 """
 
+from __future__ import annotations
+
+import os
+import platform
 import random
 import string
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import json
 import csv
+import io
 import argparse
-from typing import Generator
-import hashlib
+import itertools
+import operator
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Callable, Generator, Iterable, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to the pure-Python kernels
+    np = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is unavailable; CSV still works
+    pa = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # Inventory simulation stays in NumPy
+    njit = None
 
 # Configuration
 PRODUCTS = [
@@ -55,57 +91,362 @@ SUPPLIERS = [
     ("SUP-003", "MedSupply Co", "supplier", 2),
 ]
 
+CHANNELS = ("retail", "wholesale", "online")
+
+# Output files are written through a 1 MiB buffer to keep write() calls rare
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Rows are CSV-formatted in batches of CSV_BATCH_ROWS and encoded/written once
+# roughly CSV_CHUNK_BYTES of text has accumulated (a multiple of the FS block size)
+CSV_BATCH_ROWS = 512
+CSV_CHUNK_BYTES = 64 * 1024
+
+# Date-range shards span at most this many days, so a shard's size (and the
+# memory of the few held in flight) does not grow with --days
+SHARD_DAYS = 7
+
+# One stable SKU per product, shared by the sales rows and the product dimension
+PRODUCT_SKUS = {p[0]: f"SKU-{i:05d}" for i, p in enumerate(PRODUCTS, start=10001)}
+
+# Catalogue positions used to pack row IDs as (date ordinal << 24) |
+# (product index << 16) | location index, formatted as 16 hex digits
+PRODUCT_INDEX = {p[0]: i for i, p in enumerate(PRODUCTS)}
+LOCATION_INDEX = {l[0]: i for i, l in enumerate(LOCATIONS)}
+
+# Output schemas - generators yield tuples in exactly this column order
+SALES_COLUMNS = (
+    "transaction_id", "date", "product_name", "category", "sku",
+    "location_code", "location_name", "quantity", "unit_price",
+    "total_amount", "channel",
+)
+
+INVENTORY_COLUMNS = (
+    "snapshot_id", "date", "product_name", "category", "location_code",
+    "location_name", "quantity_on_hand", "quantity_reserved",
+    "quantity_available", "safety_stock", "reorder_point",
+    "avg_daily_demand", "days_of_supply",
+)
+
+SHIPMENT_COLUMNS = (
+    "shipment_id", "ship_date", "expected_delivery", "actual_delivery",
+    "origin_code", "origin_name", "destination_code", "destination_name",
+    "carrier_code", "carrier_name", "distance_km", "weight_kg",
+    "num_pallets", "cost", "co2_kg", "status", "on_time",
+)
+
+PRODUCT_DIM_COLUMNS = ("sku", "name", "category", "unit_price", "weight_kg", "volume_m3")
+
+LOCATION_DIM_COLUMNS = (
+    "code", "name", "type", "latitude", "longitude", "capacity_units", "cost_per_unit",
+)
 
-def generate_sku() -> str:
-    """Generate a unique SKU."""
-    return f"SKU-{random.randint(10000, 99999)}"
+CARRIER_DIM_COLUMNS = ("code", "name", "reliability", "cost_per_km", "avg_speed_kmh", "co2_per_km")
 
 
+def _day_range(start_date: datetime, end_date: datetime) -> list[datetime]:
+    """List every day from start_date to end_date inclusive."""
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+def _calendar_fields(days: list[datetime]) -> tuple[list[int], list[int]]:
+    """
+    Day-of-year and weekday (Monday == 0) for a run of consecutive days.
+    
+    Walks proleptic ordinals instead of calling timetuple()/weekday() per day;
+    only a year boundary needs a date object.
+    """
+    if not days:
+        return [], []
+    
+    first = days[0].toordinal()
+    year = days[0].year
+    year_start = date(year, 1, 1).toordinal()
+    next_year_start = date(year + 1, 1, 1).toordinal()
+    day_of_year, weekday = [], []
+    
+    for ordinal in range(first, first + len(days)):
+        if ordinal >= next_year_start:
+            year += 1
+            year_start, next_year_start = next_year_start, date(year + 1, 1, 1).toordinal()
+        day_of_year.append(ordinal - year_start + 1)
+        weekday.append((ordinal - 1) % 7)  # Ordinal 1 (0001-01-01) is a Monday
+    
+    return day_of_year, weekday
+
+
+# =============================================================================
+# Numeric Kernels
+# =============================================================================
+# Each kernel draws every random number for a shard's (day, product, location)
+# grid up front and returns nested [day][product][location] lists. The NumPy
+# variants are used when NumPy is installed on CPython; the pure-Python
+# variants (also used on PyPy, where NumPy runs through cpyext and the JIT does
+# better on plain loops) produce statistically equivalent (but not identical)
+# streams for the same seed.
+
+def _sales_demand_numpy(
+    seed: int | None,
+    days: list[datetime],
+    num_products: int,
+    num_locations: int,
+) -> tuple[list, list]:
+    """Draw sales quantities and channel indices with NumPy."""
+    rng = np.random.default_rng(seed)
+    shape = (len(days), num_products, num_locations)
+    
+    day_of_year, weekday = map(np.array, _calendar_fields(days))
+    season_base = (0.5 + 0.5 * np.abs((day_of_year - 180) / 180))[:, None, None]
+    weekend_effect = np.where(weekday >= 5, 0.7, 1.0)[:, None, None]
+    
+    seasonality = 1 + 0.3 * (1 + rng.normal(0, 0.1, shape)) * season_base
+    quantity = (rng.integers(50, 501, shape) * seasonality * weekend_effect).astype(np.int64)
+    channel = rng.integers(0, len(CHANNELS), shape)
+    
+    return quantity.tolist(), channel.tolist()
+
+
+def _sales_demand_python(
+    seed: int | None,
+    days: list[datetime],
+    num_products: int,
+    num_locations: int,
+) -> tuple[list, list]:
+    """Draw sales quantities and channel indices with random."""
+    rng = random.Random(seed)
+    gauss, randint, randrange = rng.gauss, rng.randint, rng.randrange
+    quantity, channel = [], []
+    
+    for day_of_year, weekday in zip(*_calendar_fields(days)):
+        season_base = 0.5 + 0.5 * abs((day_of_year - 180) / 180)
+        weekend_effect = 0.7 if weekday >= 5 else 1.0
+        
+        day_qty, day_channel = [], []
+        for _ in range(num_products):
+            prod_qty, prod_channel = [], []
+            for _ in range(num_locations):
+                seasonality = 1 + 0.3 * (1 + gauss(0, 0.1)) * season_base
+                prod_qty.append(int(randint(50, 500) * seasonality * weekend_effect))
+                prod_channel.append(randrange(len(CHANNELS)))
+            day_qty.append(prod_qty)
+            day_channel.append(prod_channel)
+        quantity.append(day_qty)
+        channel.append(day_channel)
+    
+    return quantity, channel
+
+
+def _simulate_on_hand(level, sold, received):
+    """
+    Carry on-hand levels forward day by day.
+    
+    Levels depend on the previous day, so days are stepped in order; each
+    step is vectorized over the (product, location) plane.
+    """
+    on_hand = np.empty(sold.shape, dtype=np.int64)
+    for d in range(sold.shape[0]):
+        level = np.maximum(0, level - sold[d] + received[d])
+        on_hand[d] = level
+    return on_hand
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _simulate_on_hand(level, sold, received):  # noqa: F811
+        """JIT variant: each (product, location) series runs in its own thread."""
+        num_days, num_products, num_locations = sold.shape
+        on_hand = np.empty(sold.shape, dtype=np.int64)
+        for p in prange(num_products):
+            for l in range(num_locations):
+                qty = level[p, l]
+                for d in range(num_days):
+                    qty = max(0, qty - sold[d, p, l] + received[d, p, l])
+                    on_hand[d, p, l] = qty
+        return on_hand
+
+
+def _inventory_levels_numpy(
+    seed: int | None,
+    num_days: int,
+    num_products: int,
+    num_locations: int,
+) -> tuple[list, list, list, list, list]:
+    """Simulate on-hand levels and sample stock parameters with NumPy."""
+    rng = np.random.default_rng(seed)
+    shape = (num_days, num_products, num_locations)
+    
+    level = rng.integers(5000, 20001, shape[1:])
+    sold = rng.integers(50, 301, shape)
+    received = np.where(rng.random(shape) > 0.7, rng.integers(0, 401, shape), 0)
+    on_hand = _simulate_on_hand(level, sold, received)
+    
+    reserved = rng.integers(0, on_hand // 10 + 1)
+    safety_stock = rng.integers(500, 2001, shape)
+    avg_daily_demand = rng.integers(100, 301, shape)
+    days_of_supply = np.round(on_hand / rng.integers(100, 301, shape), 1)
+    
+    return (
+        on_hand.tolist(),
+        reserved.tolist(),
+        safety_stock.tolist(),
+        avg_daily_demand.tolist(),
+        days_of_supply.tolist(),
+    )
+
+
+def _inventory_levels_python(
+    seed: int | None,
+    num_days: int,
+    num_products: int,
+    num_locations: int,
+) -> tuple[list, list, list, list, list]:
+    """Simulate on-hand levels and sample stock parameters with random."""
+    rng = random.Random(seed)
+    randint, rand = rng.randint, rng.random
+    level = [[randint(5000, 20000) for _ in range(num_locations)] for _ in range(num_products)]
+    on_hand, reserved, safety_stock, avg_daily_demand, days_of_supply = [], [], [], [], []
+    
+    for _ in range(num_days):
+        day_grids = ([], [], [], [], [])
+        for p in range(num_products):
+            prod_rows = ([], [], [], [], [])
+            for l in range(num_locations):
+                sold = randint(50, 300)
+                received = randint(0, 400) if rand() > 0.7 else 0
+                qty = level[p][l] = max(0, level[p][l] - sold + received)
+                
+                prod_rows[0].append(qty)
+                prod_rows[1].append(randint(0, qty // 10))
+                prod_rows[2].append(randint(500, 2000))
+                prod_rows[3].append(randint(100, 300))
+                prod_rows[4].append(round(qty / randint(100, 300), 1))
+            for grid, values in zip(day_grids, prod_rows):
+                grid.append(values)
+        for grid, values in zip(
+            (on_hand, reserved, safety_stock, avg_daily_demand, days_of_supply), day_grids
+        ):
+            grid.append(values)
+    
+    return on_hand, reserved, safety_stock, avg_daily_demand, days_of_supply
+
+
+def _shipment_plan_numpy(
+    seed: int | None,
+    num_days: int,
+    num_locations: int,
+    reliability: list[float],
+) -> tuple[list, ...]:
+    """
+    Draw every shipment's lane, carrier, delay and load with NumPy.
+    
+    Returns per-day shipment counts followed by flat per-shipment columns
+    (origin, destination, carrier, delay_days, ship_hour, weight, pallets).
+    Late deliveries are selected branchlessly against each carrier's
+    reliability.
+    """
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(5, 21, num_days)
+    total = int(counts.sum())
+    
+    origin = rng.integers(0, num_locations, total)
+    destination = rng.integers(0, num_locations - 1, total)
+    destination += destination >= origin  # Skip over the origin
+    carrier = rng.integers(0, len(reliability), total)
+    late = rng.random(total) > np.asarray(reliability)[carrier]
+    delay = np.where(late, rng.integers(1, 4, total), 0)
+    ship_hour = rng.integers(0, 13, total)
+    weight = rng.integers(100, 5001, total)
+    pallets = rng.integers(1, 21, total)
+    
+    return tuple(a.tolist() for a in (
+        counts, origin, destination, carrier, delay, ship_hour, weight, pallets,
+    ))
+
+
+def _shipment_plan_python(
+    seed: int | None,
+    num_days: int,
+    num_locations: int,
+    reliability: list[float],
+) -> tuple[list, ...]:
+    """Draw every shipment's lane, carrier, delay and load with random."""
+    rng = random.Random(seed)
+    randint, randrange, rand = rng.randint, rng.randrange, rng.random
+    counts = [randint(5, 20) for _ in range(num_days)]
+    columns = tuple([] for _ in range(7))
+    
+    for _ in range(sum(counts)):
+        origin = randrange(num_locations)
+        destination = randrange(num_locations - 1)
+        destination += destination >= origin
+        carrier = randrange(len(reliability))
+        delay = randint(1, 3) if rand() > reliability[carrier] else 0
+        
+        for column, value in zip(columns, (
+            origin, destination, carrier, delay,
+            randint(0, 12), randint(100, 5000), randint(1, 20),
+        )):
+            column.append(value)
+    
+    return (counts, *columns)
+
+
+if np is not None and platform.python_implementation() != "PyPy":
+    _sales_demand = _sales_demand_numpy
+    _inventory_levels = _inventory_levels_numpy
+    _shipment_plan = _shipment_plan_numpy
+else:
+    _sales_demand = _sales_demand_python
+    _inventory_levels = _inventory_levels_python
+    _shipment_plan = _shipment_plan_python
+
+
+# =============================================================================
+# Generators
+# =============================================================================
+
 def generate_sales_data(
     start_date: datetime,
     end_date: datetime,
     products: list,
     locations: list,
-) -> Generator[dict, None, None]:
-    """Generate daily sales transactions."""
-    current = start_date
-    while current <= end_date:
-        for product in products:
-            for location in locations:
-                if location[2] not in ["dc", "warehouse"]:
-                    continue
-                    
-                # Base demand with seasonality
-                day_of_year = current.timetuple().tm_yday
-                seasonality = 1 + 0.3 * (1 + random.gauss(0, 0.1)) * (
-                    0.5 + 0.5 * abs((day_of_year - 180) / 180)
-                )
-                
-                # Weekend effect
-                day_of_week = current.weekday()
-                weekend_effect = 0.7 if day_of_week >= 5 else 1.0
-                
-                # Random demand
-                base_demand = random.randint(50, 500)
-                quantity = int(base_demand * seasonality * weekend_effect)
-                
+    seed: int | None = None,
+) -> Generator[tuple, None, None]:
+    """
+    Generate daily sales transactions as rows in SALES_COLUMNS order.
+    
+    Demand for the whole (day, product, location) grid is drawn up front by
+    the numeric kernel; this loop only formats rows.
+    """
+    locations = [l for l in locations if l[2] in ("dc", "warehouse")]
+    location_ids = [LOCATION_INDEX[l[0]] for l in locations]
+    days = _day_range(start_date, end_date)
+    quantities, channels = _sales_demand(seed, days, len(products), len(locations))
+    
+    for current, day_qty, day_channel in zip(days, quantities, channels):
+        day_key = current.toordinal() << 24
+        date_str = f"{current.year:04d}-{current.month:02d}-{current.day:02d}"
+        
+        for product, prod_qty, prod_channel in zip(products, day_qty, day_channel):
+            prod_key = day_key | PRODUCT_INDEX[product[0]] << 16
+            sku = PRODUCT_SKUS[product[0]]
+            
+            for location, location_id, quantity, channel in zip(
+                locations, location_ids, prod_qty, prod_channel
+            ):
                 if quantity > 0:
-                    yield {
-                        "transaction_id": hashlib.md5(
-                            f"{current.isoformat()}-{product[0]}-{location[0]}".encode()
-                        ).hexdigest()[:16],
-                        "date": current.strftime("%Y-%m-%d"),
-                        "product_name": product[0],
-                        "category": product[1],
-                        "sku": generate_sku(),
-                        "location_code": location[0],
-                        "location_name": location[1],
-                        "quantity": quantity,
-                        "unit_price": product[2],
-                        "total_amount": round(quantity * product[2], 2),
-                        "channel": random.choice(["retail", "wholesale", "online"]),
-                    }
-        current += timedelta(days=1)
+                    yield (
+                        f"{prod_key | location_id:016x}",
+                        date_str,
+                        product[0],
+                        product[1],
+                        sku,
+                        location[0],
+                        location[1],
+                        quantity,
+                        product[2],
+                        round(quantity * product[2], 2),
+                        CHANNELS[channel],
+                    )
 
 
 def generate_inventory_snapshots(
@@ -113,49 +454,42 @@ def generate_inventory_snapshots(
     end_date: datetime,
     products: list,
     locations: list,
-) -> Generator[dict, None, None]:
-    """Generate daily inventory snapshots."""
-    # Initialize inventory levels
-    inventory = {}
-    for product in products:
-        for location in locations:
-            key = (product[0], location[0])
-            inventory[key] = random.randint(5000, 20000)
-    
-    current = start_date
-    while current <= end_date:
-        for product in products:
-            for location in locations:
-                key = (product[0], location[0])
-                
-                # Simulate inventory changes
-                sold = random.randint(50, 300)
-                received = random.randint(0, 400) if random.random() > 0.7 else 0
-                
-                inventory[key] = max(0, inventory[key] - sold + received)
-                
-                # Calculate safety stock and reorder point
-                safety_stock = random.randint(500, 2000)
-                reorder_point = safety_stock * 2
-                
-                yield {
-                    "snapshot_id": hashlib.md5(
-                        f"{current.isoformat()}-{product[0]}-{location[0]}".encode()
-                    ).hexdigest()[:16],
-                    "date": current.strftime("%Y-%m-%d"),
-                    "product_name": product[0],
-                    "category": product[1],
-                    "location_code": location[0],
-                    "location_name": location[1],
-                    "quantity_on_hand": inventory[key],
-                    "quantity_reserved": random.randint(0, inventory[key] // 10),
-                    "quantity_available": inventory[key],
-                    "safety_stock": safety_stock,
-                    "reorder_point": reorder_point,
-                    "avg_daily_demand": random.randint(100, 300),
-                    "days_of_supply": round(inventory[key] / random.randint(100, 300), 1),
-                }
-        current += timedelta(days=1)
+    seed: int | None = None,
+) -> Generator[tuple, None, None]:
+    """
+    Generate daily inventory snapshots as rows in INVENTORY_COLUMNS order.
+    
+    The stock simulation runs in the numeric kernel; this loop only formats rows.
+    """
+    location_ids = [LOCATION_INDEX[l[0]] for l in locations]
+    days = _day_range(start_date, end_date)
+    grids = _inventory_levels(seed, len(days), len(products), len(locations))
+    
+    for current, *day_grids in zip(days, *grids):
+        day_key = current.toordinal() << 24
+        date_str = f"{current.year:04d}-{current.month:02d}-{current.day:02d}"
+        
+        for product, *prod_rows in zip(products, *day_grids):
+            prod_key = day_key | PRODUCT_INDEX[product[0]] << 16
+            
+            for location, location_id, on_hand, reserved, safety_stock, avg_demand, dos in zip(
+                locations, location_ids, *prod_rows
+            ):
+                yield (
+                    f"{prod_key | location_id:016x}",
+                    date_str,
+                    product[0],
+                    product[1],
+                    location[0],
+                    location[1],
+                    on_hand,
+                    reserved,
+                    on_hand - reserved,
+                    safety_stock,
+                    safety_stock * 2,
+                    avg_demand,
+                    dos,
+                )
 
 
 def generate_shipments(
@@ -163,58 +497,74 @@ def generate_shipments(
     end_date: datetime,
     locations: list,
     carriers: list,
-) -> Generator[dict, None, None]:
-    """Generate shipment records."""
-    current = start_date
-    shipment_id = 1000
+    seed: int | None = None,
+) -> Generator[tuple, None, None]:
+    """
+    Generate shipment records as rows in SHIPMENT_COLUMNS order.
     
-    while current <= end_date:
-        num_shipments = random.randint(5, 20)
+    Shipment IDs are scoped to the ship day so that date-range shards
+    generated independently never collide. Lanes, carriers and delays are
+    drawn up front by the numeric kernel; this loop only formats rows.
+    """
+    now = datetime.now()
+    days = _day_range(start_date, end_date)
+    counts, *plan = _shipment_plan(seed, len(days), len(locations), [c[2] for c in carriers])
+    shipments = zip(*plan)
+    
+    # Lane distance (simplified) and transit time based on distance
+    distances = [
+        [((o[3] - d[3])**2 + (o[4] - d[4])**2)**0.5 * 111 for d in locations]
+        for o in locations
+    ]
+    transit = [[max(1, int(distance / 500)) for distance in row] for row in distances]
+    
+    for current, num_shipments in zip(days, counts):
+        day_prefix = f"{current.year:04d}{current.month:02d}{current.day:02d}"
         
-        for _ in range(num_shipments):
-            origin = random.choice(locations)
-            destination = random.choice([l for l in locations if l[0] != origin[0]])
-            carrier = random.choice(carriers)
-            
-            # Calculate distance (simplified)
-            distance = ((origin[3] - destination[3])**2 + (origin[4] - destination[4])**2)**0.5 * 111
+        for shipment_seq, (o, d, c, delay, ship_hour, weight, pallets) in enumerate(
+            itertools.islice(shipments, num_shipments)
+        ):
+            origin, destination, carrier = locations[o], locations[d], carriers[c]
+            distance = distances[o][d]
+            transit_days = transit[o][d]
             
-            # Delivery time based on distance
-            transit_days = max(1, int(distance / 500))
-            
-            # Actual delivery (with potential delays)
-            if random.random() > carrier[2]:
-                actual_days = transit_days + random.randint(1, 3)
-            else:
-                actual_days = transit_days
-            
-            ship_date = current + timedelta(hours=random.randint(0, 12))
+            ship_date = current + timedelta(hours=ship_hour)
             expected_delivery = ship_date + timedelta(days=transit_days)
-            actual_delivery = ship_date + timedelta(days=actual_days)
+            actual_delivery = ship_date + timedelta(days=transit_days + delay)
+            delivered = actual_delivery <= now
             
-            yield {
-                "shipment_id": f"SHP-{shipment_id}",
-                "ship_date": ship_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "expected_delivery": expected_delivery.strftime("%Y-%m-%d"),
-                "actual_delivery": actual_delivery.strftime("%Y-%m-%d") if actual_delivery <= datetime.now() else None,
-                "origin_code": origin[0],
-                "origin_name": origin[1],
-                "destination_code": destination[0],
-                "destination_name": destination[1],
-                "carrier_code": carrier[0],
-                "carrier_name": carrier[1],
-                "distance_km": round(distance, 1),
-                "weight_kg": random.randint(100, 5000),
-                "num_pallets": random.randint(1, 20),
-                "cost": round(distance * carrier[3], 2),
-                "co2_kg": round(distance * 0.1 * carrier[3], 2),
-                "status": "delivered" if actual_delivery <= datetime.now() else "in_transit",
-                "on_time": actual_days <= transit_days,
-            }
+            # Manual formatting is much cheaper than strftime per row
+            ship_str = (
+                f"{ship_date.year:04d}-{ship_date.month:02d}-{ship_date.day:02d} "
+                f"{ship_date.hour:02d}:{ship_date.minute:02d}:{ship_date.second:02d}"
+            )
+            expected_str = (
+                f"{expected_delivery.year:04d}-{expected_delivery.month:02d}-{expected_delivery.day:02d}"
+            )
+            actual_str = (
+                f"{actual_delivery.year:04d}-{actual_delivery.month:02d}-{actual_delivery.day:02d}"
+                if delivered else None
+            )
             
-            shipment_id += 1
-        
-        current += timedelta(days=1)
+            yield (
+                f"SHP-{day_prefix}-{shipment_seq:03d}",
+                ship_str,
+                expected_str,
+                actual_str,
+                origin[0],
+                origin[1],
+                destination[0],
+                destination[1],
+                carrier[0],
+                carrier[1],
+                round(distance, 1),
+                weight,
+                pallets,
+                round(distance * carrier[3], 2),
+                round(distance * 0.1 * carrier[3], 2),
+                "delivered" if delivered else "in_transit",
+                delay == 0,
+            )
 
 
 def generate_supply_chain_graph(
@@ -224,6 +574,8 @@ def generate_supply_chain_graph(
     """Generate Neo4j-compatible graph data."""
     nodes = []
     edges = []
+    warehouses = [l for l in locations if l[2] == "warehouse"]
+    dcs = [l for l in locations if l[2] == "dc"]
     
     # Add supplier nodes
     for sup in suppliers:
@@ -257,7 +609,7 @@ def generate_supply_chain_graph(
     # Tier 1 -> Factories (using warehouses as pseudo-factories)
     for sup in suppliers:
         if sup[3] == 1:
-            target = random.choice([l for l in locations if l[2] == "warehouse"])
+            target = random.choice(warehouses)
             edges.append({
                 "source": sup[0],
                 "target": target[0],
@@ -267,8 +619,8 @@ def generate_supply_chain_graph(
             })
     
     # Warehouses -> DCs
-    for wh in [l for l in locations if l[2] == "warehouse"]:
-        for dc in [l for l in locations if l[2] == "dc"]:
+    for wh in warehouses:
+        for dc in dcs:
             edges.append({
                 "source": wh[0],
                 "target": dc[0],
@@ -280,121 +632,297 @@ def generate_supply_chain_graph(
     return {"nodes": nodes, "edges": edges}
 
 
-def save_csv(data: list, filepath: Path, fieldnames: list = None):
-    """Save data to CSV file."""
-    if not data:
-        return
+def counted(rows: Iterable) -> tuple[Iterator, Iterator[int]]:
+    """
+    Wrap an iterable so the number of items consumed can be read afterwards.
+    
+    Returns the pass-through iterator and a counter; ``next(counter)`` after
+    exhaustion yields the item count. Counting happens in C via ``zip``.
+    """
+    counter = itertools.count()
+    return map(operator.itemgetter(0), zip(rows, counter)), counter
+
+
+def save_csv(data: Iterable[tuple], filepath: Path, headers: Sequence[str]) -> int:
+    """
+    Stream tuple rows to a CSV file.
+    
+    Accepts any iterable (including generators) so only one row needs to be
+    held in memory at a time. Rows must be in ``headers`` order. Returns the
+    number of rows written.
+    """
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return 0
     
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    if fieldnames is None:
-        fieldnames = list(data[0].keys())
+    rows, counter = counted(itertools.chain([first], rows))
+    
+    # Format each chunk into a string buffer and encode it in one go, so the
+    # binary file never goes through a per-write TextIOWrapper
+    chunk = io.StringIO(newline='')
+    writer = csv.writer(chunk)
+    writer.writerow(headers)
     
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(data)
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        while True:
+            batch = list(itertools.islice(rows, CSV_BATCH_ROWS))
+            if batch:
+                writer.writerows(batch)
+                if chunk.tell() < CSV_CHUNK_BYTES:
+                    continue
+            f.write(chunk.getvalue().encode('utf-8'))
+            if not batch:
+                break
+            chunk.seek(0)
+            chunk.truncate()
     
-    print(f"Saved {len(data)} records to {filepath}")
+    count = next(counter)
+    print(f"Saved {count} records to {filepath}")
+    return count
+
+
+def save_parquet(data: Iterable[tuple], filepath: Path, headers: Sequence[str]) -> int:
+    """
+    Write tuple rows to a zstd-compressed Parquet file.
+    
+    Rows are transposed into Arrow columns in one pass, so no per-field
+    string formatting happens. Columns holding only nulls are typed as
+    strings. Returns the number of rows written.
+    """
+    rows = list(data)
+    if not rows:
+        return 0
+    
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    columns = [pa.array(column) for column in zip(*rows)]
+    columns = [c.cast(pa.string()) if pa.types.is_null(c.type) else c for c in columns]
+    pq.write_table(pa.Table.from_arrays(columns, names=list(headers)), filepath, compression="zstd")
+    
+    print(f"Saved {len(rows)} records to {filepath}")
+    return len(rows)
 
 
 def save_json(data: dict | list, filepath: Path):
-    """Save data to JSON file."""
+    """Save data to JSON file, serializing with orjson when available."""
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
     
     print(f"Saved to {filepath}")
 
 
+def date_shards(
+    start_date: datetime,
+    end_date: datetime,
+    num_shards: int,
+) -> list[tuple[datetime, datetime]]:
+    """Split an inclusive date range into contiguous, non-overlapping shards."""
+    total_days = (end_date - start_date).days + 1
+    num_shards = max(1, min(num_shards, total_days))
+    shard_days, remainder = divmod(total_days, num_shards)
+    
+    shards = []
+    shard_start = start_date
+    for i in range(num_shards):
+        days = shard_days + (1 if i < remainder else 0)
+        shard_end = shard_start + timedelta(days=days - 1)
+        shards.append((shard_start, shard_end))
+        shard_start = shard_end + timedelta(days=1)
+    
+    return shards
+
+
+def _run_shard(generator_fn: Callable[..., Iterator[tuple]], args: tuple) -> list[tuple]:
+    """Materialize one shard inside a worker process."""
+    return list(generator_fn(*args))
+
+
+def iter_shards(
+    pool: ProcessPoolExecutor,
+    generator_fn: Callable[..., Iterator[tuple]],
+    shard_args: list[tuple],
+    max_in_flight: int,
+) -> Iterator[tuple]:
+    """
+    Fan a generator out across worker processes and yield rows in shard order.
+    
+    At most ``max_in_flight`` shards are submitted or awaiting the consumer
+    at once; the next is submitted as each one is drained, so memory stays
+    bounded by a few shards rather than the whole dataset. Rows are yielded
+    in shard order, which follows the shard layout rather than the order of
+    a serial run.
+    """
+    pending = iter(shard_args)
+    in_flight = deque(
+        pool.submit(_run_shard, generator_fn, args)
+        for args in itertools.islice(pending, max(1, max_in_flight))
+    )
+    while in_flight:
+        rows = in_flight.popleft().result()
+        args = next(pending, None)
+        if args is not None:
+            in_flight.append(pool.submit(_run_shard, generator_fn, args))
+        yield from rows
+        del rows
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate synthetic supply chain data")
     parser.add_argument("--days", type=int, default=90, help="Number of days of data")
     parser.add_argument("--output", type=str, default="./data/synthetic", help="Output directory")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument(
+        "--format", choices=("csv", "parquet"), default="csv", help="Output format for tabular data"
+    )
     args = parser.parse_args()
     
+    if args.format == "parquet" and pa is None:
+        parser.error("--format parquet requires pyarrow")
+    save_rows = save_parquet if args.format == "parquet" else save_csv
+    ext = args.format
+    
     output_dir = Path(args.output)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=args.days)
     
+    # Derive independent per-shard seeds from a single base seed
+    base_seed = args.seed if args.seed is not None else random.randrange(2**32)
+    random.seed(base_seed)
+    workers = max(1, args.workers)
+    
     print(f"Generating {args.days} days of synthetic data...")
     print(f"Date range: {start_date.date()} to {end_date.date()}")
     print(f"Output directory: {output_dir}")
+    print(f"Seed: {base_seed}, workers: {workers}")
     print()
     
-    # Generate sales data
-    print("Generating sales data...")
-    sales = list(generate_sales_data(start_date, end_date, PRODUCTS, LOCATIONS))
-    save_csv(sales, output_dir / "sales.csv")
-    
-    # Generate inventory snapshots
-    print("Generating inventory snapshots...")
-    inventory = list(generate_inventory_snapshots(start_date, end_date, PRODUCTS, LOCATIONS))
-    save_csv(inventory, output_dir / "inventory.csv")
-    
-    # Generate shipments
-    print("Generating shipment records...")
-    shipments = list(generate_shipments(start_date, end_date, LOCATIONS, CARRIERS))
-    save_csv(shipments, output_dir / "shipments.csv")
-    
-    # Generate supply chain graph
-    print("Generating supply chain graph...")
-    graph = generate_supply_chain_graph(SUPPLIERS, LOCATIONS)
-    save_json(graph, output_dir / "supply_chain_graph.json")
-    
-    # Generate dimension tables
-    print("Generating dimension tables...")
-    
-    # Products dimension
-    products_dim = [
-        {
-            "sku": f"SKU-{i:05d}",
-            "name": p[0],
-            "category": p[1],
-            "unit_price": p[2],
-            "weight_kg": round(random.uniform(0.1, 5.0), 2),
-            "volume_m3": round(random.uniform(0.001, 0.05), 4),
-        }
-        for i, p in enumerate(PRODUCTS, start=10001)
-    ]
-    save_csv(products_dim, output_dir / "dim_products.csv")
-    
-    # Locations dimension
-    locations_dim = [
-        {
-            "code": l[0],
-            "name": l[1],
-            "type": l[2],
-            "latitude": l[3],
-            "longitude": l[4],
-            "capacity_units": random.randint(50000, 200000),
-            "cost_per_unit": round(random.uniform(0.5, 2.0), 2),
-        }
-        for l in LOCATIONS
-    ]
-    save_csv(locations_dim, output_dir / "dim_locations.csv")
-    
-    # Carriers dimension
-    carriers_dim = [
-        {
-            "code": c[0],
-            "name": c[1],
-            "reliability": c[2],
-            "cost_per_km": c[3],
-            "avg_speed_kmh": random.randint(60, 100),
-            "co2_per_km": round(random.uniform(0.08, 0.15), 3),
-        }
-        for c in CARRIERS
-    ]
-    save_csv(carriers_dim, output_dir / "dim_carriers.csv")
+    total_days = (end_date - start_date).days + 1
+    shards = date_shards(start_date, end_date, max(workers, -(-total_days // SHARD_DAYS)))
+    
+    # Inventory levels carry over day to day, so shard by product instead;
+    # one product per shard is the smallest independent unit
+    product_shards = [[p] for p in PRODUCTS]
+    
+    # Fact tables are generated in worker processes and written from threads,
+    # so encoding/disk I/O for one file overlaps generation of the others
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            ThreadPoolExecutor(max_workers=4) as writer_pool:
+        # Generate sales data
+        print("Generating sales data...")
+        sales_future = writer_pool.submit(save_rows, iter_shards(
+            pool,
+            generate_sales_data,
+            [(s, e, PRODUCTS, LOCATIONS, random.getrandbits(64)) for s, e in shards],
+            workers,
+        ), output_dir / f"sales.{ext}", SALES_COLUMNS)
+        
+        # Generate inventory snapshots
+        print("Generating inventory snapshots...")
+        inventory_future = writer_pool.submit(save_rows, iter_shards(
+            pool,
+            generate_inventory_snapshots,
+            [(start_date, end_date, p, LOCATIONS, random.getrandbits(64)) for p in product_shards],
+            workers,
+        ), output_dir / f"inventory.{ext}", INVENTORY_COLUMNS)
+        
+        # Generate shipments
+        print("Generating shipment records...")
+        shipments_future = writer_pool.submit(save_rows, iter_shards(
+            pool,
+            generate_shipments,
+            [(s, e, LOCATIONS, CARRIERS, random.getrandbits(64)) for s, e in shards],
+            workers,
+        ), output_dir / f"shipments.{ext}", SHIPMENT_COLUMNS)
+        
+        # Generate supply chain graph
+        print("Generating supply chain graph...")
+        graph = generate_supply_chain_graph(SUPPLIERS, LOCATIONS)
+        graph_future = writer_pool.submit(save_json, graph, output_dir / "supply_chain_graph.json")
+        
+        # Generate dimension tables
+        print("Generating dimension tables...")
+        
+        # Products dimension
+        products_dim = [
+            (
+                PRODUCT_SKUS[p[0]],
+                p[0],
+                p[1],
+                p[2],
+                round(random.uniform(0.1, 5.0), 2),
+                round(random.uniform(0.001, 0.05), 4),
+            )
+            for p in PRODUCTS
+        ]
+        
+        # Locations dimension
+        locations_dim = [
+            (
+                l[0],
+                l[1],
+                l[2],
+                l[3],
+                l[4],
+                random.randint(50000, 200000),
+                round(random.uniform(0.5, 2.0), 2),
+            )
+            for l in LOCATIONS
+        ]
+        
+        # Carriers dimension
+        carriers_dim = [
+            (
+                c[0],
+                c[1],
+                c[2],
+                c[3],
+                random.randint(60, 100),
+                round(random.uniform(0.08, 0.15), 3),
+            )
+            for c in CARRIERS
+        ]
+        
+        futures = [
+            sales_future,
+            inventory_future,
+            shipments_future,
+            graph_future,
+            writer_pool.submit(
+                save_rows, products_dim, output_dir / f"dim_products.{ext}", PRODUCT_DIM_COLUMNS
+            ),
+            writer_pool.submit(
+                save_rows, locations_dim, output_dir / f"dim_locations.{ext}", LOCATION_DIM_COLUMNS
+            ),
+            writer_pool.submit(
+                save_rows, carriers_dim, output_dir / f"dim_carriers.{ext}", CARRIER_DIM_COLUMNS
+            ),
+        ]
+        wait(futures)
+        
+        # Surface any write error
+        for future in futures:
+            future.result()
+    
+    sales_count = sales_future.result()
+    inventory_count = inventory_future.result()
+    shipments_count = shipments_future.result()
     
     print()
     print("Data generation complete!")
     print(f"Total records generated:")
-    print(f"  - Sales: {len(sales):,}")
-    print(f"  - Inventory: {len(inventory):,}")
-    print(f"  - Shipments: {len(shipments):,}")
+    print(f"  - Sales: {sales_count:,}")
+    print(f"  - Inventory: {inventory_count:,}")
+    print(f"  - Shipments: {shipments_count:,}")
     print(f"  - Graph nodes: {len(graph['nodes'])}")
     print(f"  - Graph edges: {len(graph['edges'])}")
 
@@ -48,8 +48,12 @@ app.conf.update(
     worker_max_tasks_per_child=100,
     
     # Queue settings
+    # "ingest" holds the tasks that spend nearly all their time blocked on
+    # MySQL/MongoDB sockets; it is consumed by a green-thread worker:
+    #   celery -A celery_app worker -Q ingest -P eventlet -c 20
     task_queues=(
         Queue("ingestion", routing_key="ingestion.#"),
+        Queue("ingest", routing_key="ingest.#"),
         Queue("aggregation", routing_key="aggregation.#"),
         Queue("quality", routing_key="quality.#"),
     ),
@@ -60,8 +64,8 @@ app.conf.update(
     
     # Task routes
     task_routes={
-        "tasks.raw_to_curated.*": {"queue": "ingestion"},
-        "tasks.data_quality.*": {"queue": "quality"},
+        "tasks.raw_to_curated.*": {"queue": "ingest"},
+        "tasks.data_quality.*": {"queue": "ingest"},
         "tasks.aggregations.*": {"queue": "aggregation"},
     },
     
@@ -77,10 +81,15 @@ app.conf.update(
             "schedule": 86400.0,  # Daily
             "options": {"queue": "aggregation"},
         },
+        "hourly-materialized-view-refresh": {
+            "task": "tasks.aggregations.refresh_materialized_views",
+            "schedule": 3600.0,  # Every hour
+            "options": {"queue": "aggregation"},
+        },
         "hourly-data-quality-check": {
             "task": "tasks.data_quality.run_quality_checks",
             "schedule": 3600.0,  # Every hour
-            "options": {"queue": "quality"},
+            "options": {"queue": "ingest"},
         },
     },
 )
@@ -10,6 +10,8 @@ from typing import Any
 
 import structlog
 from celery import Task
+from celery.signals import worker_process_init
+from redis import Redis
 from sqlalchemy import create_engine, text
 
 from celery_app import app
@@ -19,10 +21,160 @@ logger = structlog.get_logger()
 settings = get_settings()
 
 
-def get_mysql_engine():
-    """Get SQLAlchemy engine for MySQL."""
+# One pooled engine per worker process, reused by every task it runs
+_engine = None
+
+
+def _create_mysql_engine():
+    """Create the pooled SQLAlchemy engine for MySQL."""
     dsn = settings.MYSQL_DSN.replace("asyncmy", "pymysql")
-    return create_engine(dsn, pool_pre_ping=True)
+    # Rollups run hourly or daily, so pooled connections sit idle long enough
+    # to go stale; pre-ping them, and keep the pool small since a worker
+    # process runs one task at a time
+    return create_engine(
+        dsn,
+        pool_pre_ping=True,
+        pool_size=2,
+        pool_recycle=1800,
+    )
+
+
+@worker_process_init.connect
+def _init_mysql_engine(**kwargs) -> None:
+    """Build the engine after fork so pooled sockets are never shared between processes."""
+    global _engine
+    _engine = _create_mysql_engine()
+
+
+def get_mysql_engine():
+    """Get the worker's shared SQLAlchemy engine for MySQL."""
+    global _engine
+    if _engine is None:
+        _engine = _create_mysql_engine()
+    return _engine
+
+
+# Summary tables with a real refresh: each table's statements run in order,
+# in their own transaction, over the trailing window of date keys
+# (:since_key onwards)
+MATERIALIZED_VIEW_REFRESH = {
+    # Backs the API inventory heatmap. Region is the location's country, and
+    # at-risk units are stock below safety stock, the same rule ingestion
+    # uses for at_risk_value. Both key columns are NOT NULL, hence the
+    # fallbacks.
+    "mv_inventory_xy": (
+        text("DELETE FROM mv_inventory_xy WHERE date_key >= :since_key"),
+        text("""
+            INSERT INTO mv_inventory_xy (
+                date_key, region, category,
+                at_risk_units, days_of_supply_sum, days_of_supply_count
+            )
+            SELECT
+                f.date_key,
+                COALESCE(l.country, 'Unknown'),
+                COALESCE(p.category, 'Uncategorized'),
+                SUM(CASE WHEN f.quantity_available < f.safety_stock THEN f.quantity_available ELSE 0 END),
+                SUM(f.days_of_supply),
+                COUNT(f.days_of_supply)
+            FROM fact_inventory_snapshot f
+            JOIN dim_product p ON f.product_sk = p.product_sk
+            JOIN dim_location l ON f.location_sk = l.location_sk
+            WHERE f.date_key >= :since_key
+            GROUP BY
+                f.date_key,
+                COALESCE(l.country, 'Unknown'),
+                COALESCE(p.category, 'Uncategorized')
+        """),
+    ),
+    # Backs every API sustainability endpoint. Mode comes from the shipment
+    # itself and region is the destination's country. LEFT JOINs keep
+    # shipments with no location row in the totals; the API filters the
+    # NULLs out where it groups by region or route.
+    "agg_emissions_daily": (
+        text("DELETE FROM agg_emissions_daily WHERE date_key >= :since_key"),
+        text("""
+            INSERT INTO agg_emissions_daily (
+                date_key, mode, region, from_name, to_name,
+                shipments, total_co2_kg, total_units, total_distance_km
+            )
+            SELECT
+                f.shipment_date_key,
+                f.transport_mode,
+                tl.country,
+                fl.location_name,
+                tl.location_name,
+                COUNT(*),
+                COALESCE(SUM(f.co2_emission_kg), 0),
+                COALESCE(SUM(f.units), 0),
+                COALESCE(SUM(f.distance_km), 0)
+            FROM fact_shipment f
+            LEFT JOIN dim_location fl ON f.origin_location_sk = fl.location_sk
+            LEFT JOIN dim_location tl ON f.destination_location_sk = tl.location_sk
+            WHERE f.shipment_date_key >= :since_key
+            GROUP BY
+                f.shipment_date_key, f.transport_mode,
+                tl.country, fl.location_name, tl.location_name
+        """),
+    ),
+}
+
+
+def _invalidate_emissions_cache() -> None:
+    """Drop the API's cached emissions aggregates once agg_emissions_daily is rebuilt."""
+    # Best effort: the cache entries also expire on their own TTL
+    try:
+        client = Redis.from_url(settings.REDIS_URL)
+        try:
+            keys = list(client.scan_iter("emissions:*"))
+            if keys:
+                client.delete(*keys)
+        finally:
+            client.close()
+    except Exception as e:
+        logger.warning("emissions_cache_invalidation_failed", error=str(e))
+
+
+# Daily sales, inventory and logistics trends in one round-trip. Each branch
+# is tagged with its source and padded to the same (v1, v2, v3) shape
+# (order_id is unique on fact_sales, so orders are a plain COUNT):
+#   sales:     revenue, units, orders
+#   inventory: avg days of supply, low-stock count, -
+#   logistics: shipments, CO2 kg, cost
+KPI_TRENDS_QUERY = text("""
+    SELECT
+        'sales' AS source,
+        d.full_date,
+        SUM(fs.total_amount) AS v1,
+        SUM(fs.quantity) AS v2,
+        COUNT(fs.order_id) AS v3
+    FROM fact_sales fs
+    JOIN dim_date d ON fs.date_key = d.date_key
+    WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
+    GROUP BY d.full_date
+    UNION ALL
+    SELECT
+        'inventory',
+        d.full_date,
+        AVG(fi.days_of_supply),
+        SUM(CASE WHEN fi.quantity_available < fi.safety_stock THEN 1 ELSE 0 END),
+        NULL
+    FROM fact_inventory_snapshot fi
+    JOIN dim_date d ON fi.date_key = d.date_key
+    WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
+    GROUP BY d.full_date
+    UNION ALL
+    SELECT
+        'logistics',
+        d.full_date,
+        COUNT(*),
+        SUM(fs.co2_emission_kg),
+        SUM(fs.cost_usd)
+    FROM fact_shipment fs
+    JOIN dim_date d ON fs.shipment_date_key = d.date_key
+    WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
+    GROUP BY d.full_date
+    ORDER BY source, full_date
+""")
 
 
 class AggregationTask(Task):
@@ -62,24 +214,47 @@ def aggregate_daily_sales(self, target_date: str = None) -> dict[str, Any]:
             logger.warning("date_not_found", target_date=target_date)
             return {"error": f"Date {target_date} not found in dim_date"}
         
+        # Scan the day's fact rows once, collapsing them to one row per
+        # (product, location) that both rollups re-group. order_id is unique
+        # on fact_sales, so each order lands in exactly one of these rows and
+        # summing the per-row order counts is exact; likewise each product
+        # has one row per location, so counting rows counts distinct products
+        conn.execute(text("DROP TEMPORARY TABLE IF EXISTS tmp_daily_sales"))
+        conn.execute(
+            text("""
+                CREATE TEMPORARY TABLE tmp_daily_sales AS
+                SELECT
+                    product_sk,
+                    location_sk,
+                    SUM(quantity) as quantity,
+                    SUM(total_amount) as revenue,
+                    SUM(unit_price) as unit_price_sum,
+                    COUNT(unit_price) as unit_price_count,
+                    COUNT(order_id) as order_count
+                FROM fact_sales
+                WHERE date_key = :date_key
+                GROUP BY product_sk, location_sk
+            """),
+            {"date_key": date_key},
+        )
+        
         # Aggregate by product
-        product_agg = conn.execute(
+        conn.execute(
             text("""
                 INSERT INTO agg_daily_product_sales (
                     date_key, product_sk, total_quantity, total_revenue,
                     avg_unit_price, order_count, created_at
                 )
                 SELECT
-                    date_key,
+                    :date_key,
                     product_sk,
                     SUM(quantity) as total_quantity,
-                    SUM(total_amount) as total_revenue,
-                    AVG(unit_price) as avg_unit_price,
-                    COUNT(DISTINCT order_id) as order_count,
+                    SUM(revenue) as total_revenue,
+                    SUM(unit_price_sum) / NULLIF(SUM(unit_price_count), 0) as avg_unit_price,
+                    SUM(order_count) as order_count,
                     NOW()
-                FROM fact_sales
-                WHERE date_key = :date_key
-                GROUP BY date_key, product_sk
+                FROM tmp_daily_sales
+                GROUP BY product_sk
                 ON DUPLICATE KEY UPDATE
                     total_quantity = VALUES(total_quantity),
                     total_revenue = VALUES(total_revenue),
@@ -91,23 +266,22 @@ def aggregate_daily_sales(self, target_date: str = None) -> dict[str, Any]:
         )
         
         # Aggregate by location
-        location_agg = conn.execute(
+        conn.execute(
             text("""
                 INSERT INTO agg_daily_location_sales (
                     date_key, location_sk, total_quantity, total_revenue,
                     unique_products, order_count, created_at
                 )
                 SELECT
-                    date_key,
+                    :date_key,
                     location_sk,
                     SUM(quantity) as total_quantity,
-                    SUM(total_amount) as total_revenue,
-                    COUNT(DISTINCT product_sk) as unique_products,
-                    COUNT(DISTINCT order_id) as order_count,
+                    SUM(revenue) as total_revenue,
+                    COUNT(*) as unique_products,
+                    SUM(order_count) as order_count,
                     NOW()
-                FROM fact_sales
-                WHERE date_key = :date_key
-                GROUP BY date_key, location_sk
+                FROM tmp_daily_sales
+                GROUP BY location_sk
                 ON DUPLICATE KEY UPDATE
                     total_quantity = VALUES(total_quantity),
                     total_revenue = VALUES(total_revenue),
@@ -118,10 +292,9 @@ def aggregate_daily_sales(self, target_date: str = None) -> dict[str, Any]:
             {"date_key": date_key},
         )
         
+        conn.execute(text("DROP TEMPORARY TABLE tmp_daily_sales"))
         conn.commit()
     
-    engine.dispose()
-    
     logger.info("aggregate_daily_sales_completed", target_date=target_date)
     
     return {
@@ -178,8 +351,6 @@ def snapshot_inventory(self, snapshot_date: str = None) -> dict[str, Any]:
         
         conn.commit()
     
-    engine.dispose()
-    
     if result:
         stats = {
             "snapshot_date": snapshot_date,
@@ -216,98 +387,50 @@ def compute_kpi_trends(self, days: int = 30) -> dict[str, Any]:
     engine = get_mysql_engine()
     
     with engine.connect() as conn:
-        # Sales trends
-        sales_trend = conn.execute(
-            text("""
-                SELECT
-                    d.full_date,
-                    SUM(fs.total_amount) as revenue,
-                    SUM(fs.quantity) as units,
-                    COUNT(DISTINCT fs.order_id) as orders
-                FROM fact_sales fs
-                JOIN dim_date d ON fs.date_key = d.date_key
-                WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
-                GROUP BY d.full_date
-                ORDER BY d.full_date
-            """),
-            {"days": days},
-        ).fetchall()
-        
-        # Inventory trend
-        inventory_trend = conn.execute(
-            text("""
-                SELECT
-                    d.full_date,
-                    AVG(fi.days_of_supply) as avg_dos,
-                    SUM(CASE WHEN fi.quantity_available < fi.safety_stock THEN 1 ELSE 0 END) as low_stock
-                FROM fact_inventory_snapshot fi
-                JOIN dim_date d ON fi.date_key = d.date_key
-                WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
-                GROUP BY d.full_date
-                ORDER BY d.full_date
-            """),
-            {"days": days},
-        ).fetchall()
-        
-        # Shipment trend
-        shipment_trend = conn.execute(
-            text("""
-                SELECT
-                    d.full_date,
-                    COUNT(*) as shipments,
-                    SUM(fs.co2_emission_kg) as co2_kg,
-                    SUM(fs.cost_usd) as cost
-                FROM fact_shipment fs
-                JOIN dim_date d ON fs.shipment_date_key = d.date_key
-                WHERE d.full_date >= DATE_SUB(CURDATE(), INTERVAL :days DAY)
-                GROUP BY d.full_date
-                ORDER BY d.full_date
-            """),
-            {"days": days},
-        ).fetchall()
-    
-    engine.dispose()
+        rows = conn.execute(KPI_TRENDS_QUERY, {"days": days}).fetchall()
     
     trends = {
         "period_days": days,
-        "sales": [
-            {
-                "date": str(r[0]),
-                "revenue": float(r[1] or 0),
-                "units": int(r[2] or 0),
-                "orders": int(r[3] or 0),
-            }
-            for r in sales_trend
-        ],
-        "inventory": [
-            {
-                "date": str(r[0]),
-                "avg_days_of_supply": float(r[1] or 0),
-                "low_stock_count": int(r[2] or 0),
-            }
-            for r in inventory_trend
-        ],
-        "logistics": [
-            {
-                "date": str(r[0]),
-                "shipments": int(r[1] or 0),
-                "co2_kg": float(r[2] or 0),
-                "cost": float(r[3] or 0),
-            }
-            for r in shipment_trend
-        ],
+        "sales": [],
+        "inventory": [],
+        "logistics": [],
     }
     
+    for source, full_date, v1, v2, v3 in rows:
+        if source == "sales":
+            trends["sales"].append({
+                "date": str(full_date),
+                "revenue": float(v1 or 0),
+                "units": int(v2 or 0),
+                "orders": int(v3 or 0),
+            })
+        elif source == "inventory":
+            trends["inventory"].append({
+                "date": str(full_date),
+                "avg_days_of_supply": float(v1 or 0),
+                "low_stock_count": int(v2 or 0),
+            })
+        else:
+            trends["logistics"].append({
+                "date": str(full_date),
+                "shipments": int(v1 or 0),
+                "co2_kg": float(v2 or 0),
+                "cost": float(v3 or 0),
+            })
+    
     logger.info("compute_kpi_trends_completed", days=days)
     
     return trends
 
 
 @app.task(name="tasks.aggregations.refresh_materialized_views")
-def refresh_materialized_views() -> dict[str, Any]:
+def refresh_materialized_views(days: int = 2) -> dict[str, Any]:
     """
     Refresh materialized views for dashboard performance.
     
+    Args:
+        days: Trailing number of days to rebuild in summary tables
+    
     Returns:
         Refresh status
     """
@@ -323,8 +446,13 @@ def refresh_materialized_views() -> dict[str, Any]:
         "mv_daily_sales_summary",
         "mv_product_performance",
         "mv_location_metrics",
+        "mv_inventory_xy",
+        "agg_emissions_daily",
     ]
     
+    since = datetime.now(timezone.utc).date() - timedelta(days=days)
+    since_key = since.year * 10000 + since.month * 100 + since.day
+    
     with engine.connect() as conn:
         for view in views_to_refresh:
             try:
@@ -339,16 +467,23 @@ def refresh_materialized_views() -> dict[str, Any]:
                 ).fetchone()
                 
                 if exists:
-                    # Truncate and repopulate would go here
-                    # For now, just mark as refreshed
+                    for statement in MATERIALIZED_VIEW_REFRESH.get(view, ()):
+                        conn.execute(statement, {"since_key": since_key})
+                
+                # One transaction per view, so a failed INSERT never commits
+                # the DELETE of the window it was rebuilding
+                conn.commit()
+                if exists:
                     refreshed.append(view)
                 
             except Exception as e:
+                conn.rollback()
                 logger.error("view_refresh_error", view=view, error=str(e))
-        
-        conn.commit()
     
-    engine.dispose()
+    # The API serves emissions from agg_emissions_daily, so cached responses
+    # only go stale once it has been rebuilt
+    if "agg_emissions_daily" in refreshed:
+        _invalidate_emissions_cache()
     
     logger.info("refresh_materialized_views_completed", refreshed=refreshed)
     
@@ -10,6 +10,7 @@ from typing import Any
 
 import structlog
 from celery import Task
+from celery.signals import worker_process_init
 from sqlalchemy import create_engine, text
 
 from celery_app import app
@@ -19,10 +20,36 @@ logger = structlog.get_logger()
 settings = get_settings()
 
 
-def get_mysql_engine():
-    """Get SQLAlchemy engine for MySQL."""
+# One pooled engine per worker process, reused by every task it runs
+_engine = None
+
+
+def _create_mysql_engine():
+    """Create the pooled SQLAlchemy engine for MySQL."""
     dsn = settings.MYSQL_DSN.replace("asyncmy", "pymysql")
-    return create_engine(dsn, pool_pre_ping=True)
+    # Checks run hourly, so pooled connections sit idle long enough to go
+    # stale; pre-ping them, and keep the pool small
+    return create_engine(
+        dsn,
+        pool_pre_ping=True,
+        pool_size=2,
+        pool_recycle=3600,
+    )
+
+
+@worker_process_init.connect
+def _init_mysql_engine(**kwargs) -> None:
+    """Build the engine after fork so pooled sockets are never shared between processes."""
+    global _engine
+    _engine = _create_mysql_engine()
+
+
+def get_mysql_engine():
+    """Get the worker's shared SQLAlchemy engine for MySQL."""
+    global _engine
+    if _engine is None:
+        _engine = _create_mysql_engine()
+    return _engine
 
 
 class QualityCheckTask(Task):
@@ -51,6 +78,10 @@ def run_quality_checks(self) -> dict[str, Any]:
         "warnings": 0,
     }
     
+    # A failure here raises, so the task is retried rather than reporting
+    # every check as errored
+    counts = fetch_quality_counts()
+    
     checks = [
         check_orphaned_facts,
         check_duplicate_sales,
@@ -62,7 +93,7 @@ def run_quality_checks(self) -> dict[str, Any]:
     
     for check_fn in checks:
         try:
-            result = check_fn()
+            result = check_fn(counts)
             results["checks"].append(result)
             
             if result["status"] == "passed":
@@ -91,212 +122,216 @@ def run_quality_checks(self) -> dict[str, Any]:
     return results
 
 
-def check_orphaned_facts() -> dict:
-    """Check for fact records missing dimension relationships."""
+# =============================================================================
+# Check Queries
+# =============================================================================
+# Every check is a COUNT, so they are fused into one statement of scalar
+# subqueries: one round-trip instead of one connection and query per check.
+
+STALE_FORECAST_DAYS = 30
+
+QUALITY_COUNTS_QUERY = text("""
+    SELECT
+        (
+            -- NOT EXISTS probes each dimension's primary key instead of
+            -- joining all three dimensions across the whole fact table
+            SELECT COUNT(*) FROM fact_sales fs
+            WHERE NOT EXISTS (SELECT 1 FROM dim_date d WHERE d.date_key = fs.date_key)
+            OR NOT EXISTS (SELECT 1 FROM dim_product p WHERE p.product_sk = fs.product_sk)
+            OR NOT EXISTS (SELECT 1 FROM dim_location l WHERE l.location_sk = fs.location_sk)
+        ) AS orphaned_sales,
+        (
+            SELECT COUNT(*) FROM (
+                SELECT order_id
+                FROM fact_sales
+                WHERE order_id IS NOT NULL
+                GROUP BY order_id
+                HAVING COUNT(*) > 1
+                LIMIT 100
+            ) dup
+        ) AS duplicate_orders,
+        (
+            SELECT COUNT(*) FROM fact_sales WHERE quantity < 0
+        ) AS negative_sales,
+        (
+            SELECT COUNT(*) FROM fact_inventory_snapshot WHERE quantity_on_hand < 0
+        ) AS negative_inventory,
+        (
+            SELECT COUNT(*) FROM fact_sales fs
+            JOIN dim_date d ON fs.date_key = d.date_key
+            WHERE d.full_date > :today
+        ) AS future_sales,
+        (
+            SELECT COUNT(*) FROM ml_model
+            WHERE status = 'prod'
+            AND trained_at < DATE_SUB(NOW(), INTERVAL :stale_days DAY)
+        ) AS stale_models,
+        latest_inventory.low_stock,
+        latest_inventory.critical_stock
+    FROM (
+        -- Both inventory counts come from one scan of the latest snapshot
+        SELECT
+            COALESCE(SUM(
+                CASE WHEN quantity_available < safety_stock AND safety_stock IS NOT NULL
+                THEN 1 ELSE 0 END
+            ), 0) AS low_stock,
+            COALESCE(SUM(CASE WHEN days_of_supply < 3 THEN 1 ELSE 0 END), 0) AS critical_stock
+        FROM fact_inventory_snapshot
+        WHERE date_key = (SELECT MAX(date_key) FROM fact_inventory_snapshot)
+    ) latest_inventory
+""")
+
+
+def fetch_quality_counts() -> dict[str, int]:
+    """Run every check's COUNT in a single query and return them by name."""
     engine = get_mysql_engine()
     
     with engine.connect() as conn:
-        # Check fact_sales for missing dimensions
-        orphaned = conn.execute(
-            text("""
-                SELECT COUNT(*) FROM fact_sales fs
-                LEFT JOIN dim_date d ON fs.date_key = d.date_key
-                LEFT JOIN dim_product p ON fs.product_sk = p.product_sk
-                LEFT JOIN dim_location l ON fs.location_sk = l.location_sk
-                WHERE d.date_key IS NULL OR p.product_sk IS NULL OR l.location_sk IS NULL
-            """)
-        ).scalar()
-        
-        engine.dispose()
-        
-        if orphaned > 0:
-            return {
-                "name": "orphaned_facts",
-                "status": "failed",
-                "message": f"Found {orphaned} orphaned fact_sales records",
-                "count": orphaned,
-            }
-        
+        row = conn.execute(
+            QUALITY_COUNTS_QUERY,
+            {
+                "today": datetime.now(timezone.utc).date(),
+                "stale_days": STALE_FORECAST_DAYS,
+            },
+        ).mappings().one()
+    
+    # SUM() comes back as Decimal; keep the task result JSON-friendly
+    return {name: int(value) for name, value in row.items()}
+
+
+# =============================================================================
+# Checks
+# =============================================================================
+
+def check_orphaned_facts(counts: dict[str, int]) -> dict:
+    """Check for fact records missing dimension relationships."""
+    orphaned = counts["orphaned_sales"]
+    
+    if orphaned > 0:
         return {
             "name": "orphaned_facts",
-            "status": "passed",
-            "message": "No orphaned records found",
-            "count": 0,
+            "status": "failed",
+            "message": f"Found {orphaned} orphaned fact_sales records",
+            "count": orphaned,
         }
+    
+    return {
+        "name": "orphaned_facts",
+        "status": "passed",
+        "message": "No orphaned records found",
+        "count": 0,
+    }
 
 
-def check_duplicate_sales() -> dict:
+def check_duplicate_sales(counts: dict[str, int]) -> dict:
     """Check for duplicate sales transactions."""
-    engine = get_mysql_engine()
+    duplicates = counts["duplicate_orders"]
     
-    with engine.connect() as conn:
-        duplicates = conn.execute(
-            text("""
-                SELECT order_id, COUNT(*) as cnt
-                FROM fact_sales
-                WHERE order_id IS NOT NULL
-                GROUP BY order_id
-                HAVING cnt > 1
-                LIMIT 100
-            """)
-        ).fetchall()
-        
-        engine.dispose()
-        
-        if duplicates:
-            return {
-                "name": "duplicate_sales",
-                "status": "failed",
-                "message": f"Found {len(duplicates)} duplicate order IDs",
-                "count": len(duplicates),
-            }
-        
+    if duplicates > 0:
         return {
             "name": "duplicate_sales",
-            "status": "passed",
-            "message": "No duplicate orders found",
-            "count": 0,
+            "status": "failed",
+            "message": f"Found {duplicates} duplicate order IDs",
+            "count": duplicates,
         }
+    
+    return {
+        "name": "duplicate_sales",
+        "status": "passed",
+        "message": "No duplicate orders found",
+        "count": 0,
+    }
 
 
-def check_negative_quantities() -> dict:
+def check_negative_quantities(counts: dict[str, int]) -> dict:
     """Check for records with negative quantities."""
-    engine = get_mysql_engine()
+    negative_sales = counts["negative_sales"]
+    negative_inventory = counts["negative_inventory"]
+    total = negative_sales + negative_inventory
     
-    with engine.connect() as conn:
-        negative_sales = conn.execute(
-            text("SELECT COUNT(*) FROM fact_sales WHERE quantity < 0")
-        ).scalar()
-        
-        negative_inventory = conn.execute(
-            text("SELECT COUNT(*) FROM fact_inventory_snapshot WHERE quantity_on_hand < 0")
-        ).scalar()
-        
-        engine.dispose()
-        
-        total = negative_sales + negative_inventory
-        
-        if total > 0:
-            return {
-                "name": "negative_quantities",
-                "status": "warning",
-                "message": f"Found {negative_sales} negative sales, {negative_inventory} negative inventory",
-                "count": total,
-            }
-        
+    if total > 0:
         return {
             "name": "negative_quantities",
-            "status": "passed",
-            "message": "No negative quantities found",
-            "count": 0,
+            "status": "warning",
+            "message": f"Found {negative_sales} negative sales, {negative_inventory} negative inventory",
+            "count": total,
         }
+    
+    return {
+        "name": "negative_quantities",
+        "status": "passed",
+        "message": "No negative quantities found",
+        "count": 0,
+    }
 
 
-def check_future_dates() -> dict:
+def check_future_dates(counts: dict[str, int]) -> dict:
     """Check for records with future dates."""
-    engine = get_mysql_engine()
-    today = datetime.now(timezone.utc).date()
+    future_sales = counts["future_sales"]
     
-    with engine.connect() as conn:
-        future_sales = conn.execute(
-            text("""
-                SELECT COUNT(*) FROM fact_sales fs
-                JOIN dim_date d ON fs.date_key = d.date_key
-                WHERE d.full_date > :today
-            """),
-            {"today": today},
-        ).scalar()
-        
-        engine.dispose()
-        
-        if future_sales > 0:
-            return {
-                "name": "future_dates",
-                "status": "warning",
-                "message": f"Found {future_sales} sales with future dates",
-                "count": future_sales,
-            }
-        
+    if future_sales > 0:
         return {
             "name": "future_dates",
-            "status": "passed",
-            "message": "No future-dated records found",
-            "count": 0,
+            "status": "warning",
+            "message": f"Found {future_sales} sales with future dates",
+            "count": future_sales,
         }
+    
+    return {
+        "name": "future_dates",
+        "status": "passed",
+        "message": "No future-dated records found",
+        "count": 0,
+    }
 
 
-def check_stale_forecasts() -> dict:
+def check_stale_forecasts(counts: dict[str, int]) -> dict:
     """Check for stale forecast models."""
-    engine = get_mysql_engine()
-    stale_days = 30
+    stale_models = counts["stale_models"]
     
-    with engine.connect() as conn:
-        stale_models = conn.execute(
-            text("""
-                SELECT COUNT(*) FROM ml_model
-                WHERE status = 'prod'
-                AND trained_at < DATE_SUB(NOW(), INTERVAL :days DAY)
-            """),
-            {"days": stale_days},
-        ).scalar()
-        
-        engine.dispose()
-        
-        if stale_models > 0:
-            return {
-                "name": "stale_forecasts",
-                "status": "warning",
-                "message": f"Found {stale_models} production models older than {stale_days} days",
-                "count": stale_models,
-            }
-        
+    if stale_models > 0:
         return {
             "name": "stale_forecasts",
-            "status": "passed",
-            "message": "All production models are up to date",
-            "count": 0,
+            "status": "warning",
+            "message": f"Found {stale_models} production models older than {STALE_FORECAST_DAYS} days",
+            "count": stale_models,
         }
+    
+    return {
+        "name": "stale_forecasts",
+        "status": "passed",
+        "message": "All production models are up to date",
+        "count": 0,
+    }
 
 
-def check_inventory_anomalies() -> dict:
+def check_inventory_anomalies(counts: dict[str, int]) -> dict:
     """Check for inventory anomalies (low stock, overstock)."""
-    engine = get_mysql_engine()
+    low_stock = counts["low_stock"]
+    critical = counts["critical_stock"]
     
-    with engine.connect() as conn:
-        # Check for items below safety stock
-        low_stock = conn.execute(
-            text("""
-                SELECT COUNT(*) FROM fact_inventory_snapshot
-                WHERE quantity_available < safety_stock
-                AND safety_stock IS NOT NULL
-                AND date_key = (SELECT MAX(date_key) FROM fact_inventory_snapshot)
-            """)
-        ).scalar()
-        
-        # Check for items with negative days of supply
-        critical = conn.execute(
-            text("""
-                SELECT COUNT(*) FROM fact_inventory_snapshot
-                WHERE days_of_supply < 3
-                AND date_key = (SELECT MAX(date_key) FROM fact_inventory_snapshot)
-            """)
-        ).scalar()
-        
-        engine.dispose()
-        
-        status = "passed"
-        if critical > 0:
-            status = "failed"
-        elif low_stock > 0:
-            status = "warning"
-        
-        return {
-            "name": "inventory_anomalies",
-            "status": status,
-            "message": f"Low stock: {low_stock}, Critical (<3 days): {critical}",
-            "low_stock": low_stock,
-            "critical": critical,
-        }
+    status = "passed"
+    if critical > 0:
+        status = "failed"
+    elif low_stock > 0:
+        status = "warning"
+    
+    return {
+        "name": "inventory_anomalies",
+        "status": status,
+        "message": f"Low stock: {low_stock}, Critical (<3 days): {critical}",
+        "low_stock": low_stock,
+        "critical": critical,
+    }
+
+
+# Allowed dimension tables and the predicate flagging rows with missing keys
+DIMENSION_NULL_KEYS = {
+    "dim_date": None,
+    "dim_product": "product_id IS NULL OR product_name IS NULL",
+    "dim_location": "location_id IS NULL OR location_name IS NULL",
+    "dim_carrier": None,
+}
 
 
 @app.task(name="tasks.data_quality.validate_dimension")
@@ -310,42 +345,28 @@ def validate_dimension(dimension_table: str) -> dict:
     Returns:
         Validation results
     """
-    engine = get_mysql_engine()
+    if dimension_table not in DIMENSION_NULL_KEYS:
+        return {"error": f"Invalid table: {dimension_table}"}
     
-    allowed_tables = ["dim_date", "dim_product", "dim_location", "dim_carrier"]
+    # Total and null-key counts come back from a single scan
+    null_keys = DIMENSION_NULL_KEYS[dimension_table]
+    nulls_expr = f"SUM(CASE WHEN {null_keys} THEN 1 ELSE 0 END)" if null_keys else "0"
     
-    if dimension_table not in allowed_tables:
-        return {"error": f"Invalid table: {dimension_table}"}
+    engine = get_mysql_engine()
     
     with engine.connect() as conn:
-        # Count total records
-        total = conn.execute(
-            text(f"SELECT COUNT(*) FROM {dimension_table}")
-        ).scalar()
-        
-        # Count nulls in key columns
-        if dimension_table == "dim_product":
-            nulls = conn.execute(
-                text("""
-                    SELECT COUNT(*) FROM dim_product
-                    WHERE product_id IS NULL OR product_name IS NULL
-                """)
-            ).scalar()
-        elif dimension_table == "dim_location":
-            nulls = conn.execute(
-                text("""
-                    SELECT COUNT(*) FROM dim_location
-                    WHERE location_id IS NULL OR location_name IS NULL
-                """)
-            ).scalar()
-        else:
-            nulls = 0
-        
-        engine.dispose()
-        
-        return {
-            "table": dimension_table,
-            "total_records": total,
-            "null_key_fields": nulls,
-            "status": "passed" if nulls == 0 else "failed",
-        }
+        row = conn.execute(
+            text(f"""
+                SELECT COUNT(*) AS total, COALESCE({nulls_expr}, 0) AS nulls
+                FROM {dimension_table}
+            """)
+        ).one()
+    
+    total, nulls = int(row.total), int(row.nulls)
+    
+    return {
+        "table": dimension_table,
+        "total_records": total,
+        "null_key_fields": nulls,
+        "status": "passed" if nulls == 0 else "failed",
+    }
@@ -5,12 +5,12 @@
 Celery tasks for transforming raw events from MongoDB to curated MySQL warehouse.
 """
 
-import hashlib
 from datetime import datetime, timezone
 from typing import Any
 
 import structlog
 from celery import Task
+from celery.signals import worker_process_init
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from sqlalchemy.orm import Session
@@ -29,17 +29,137 @@ def get_mongo_client() -> MongoClient:
     return MongoClient(settings.MONGO_URI)
 
 
-def get_mysql_engine():
-    """Get SQLAlchemy engine for MySQL."""
+# One pooled engine per worker process, reused by every task it runs
+_engine = None
+
+
+def _create_mysql_engine():
+    """Create the pooled SQLAlchemy engine for MySQL."""
     # Use sync driver for Celery
     dsn = settings.MYSQL_DSN.replace("asyncmy", "pymysql")
-    return create_engine(dsn, pool_pre_ping=True)
+    # No pre-ping: a task holds one connection for its whole run, so a
+    # SELECT 1 on checkout buys little; recycling well inside MySQL's
+    # wait_timeout keeps stale sockets out of the pool instead
+    return create_engine(
+        dsn,
+        pool_size=4,
+        max_overflow=20,
+        pool_recycle=1800,
+    )
+
+
+@worker_process_init.connect
+def _init_mysql_engine(**kwargs) -> None:
+    """Build the engine after fork so pooled sockets are never shared between processes."""
+    global _engine
+    _engine = _create_mysql_engine()
+
+
+def get_mysql_engine():
+    """Get the worker's shared SQLAlchemy engine for MySQL."""
+    global _engine
+    if _engine is None:
+        _engine = _create_mysql_engine()
+    return _engine
+
+
+# =============================================================================
+# Fact Statements
+# =============================================================================
+# Executed with a list of parameter dicts, which PyMySQL rewrites into a
+# single multi-row VALUES statement per batch. Duplicate order IDs and
+# shipment numbers are dropped by their unique indexes (INSERT IGNORE)
+# instead of being checked with a SELECT per document.
+
+INSERT_FACT_SALES = text("""
+    INSERT IGNORE INTO fact_sales (
+        date_key, product_sk, location_sk,
+        quantity, unit_price, discount_pct, total_amount,
+        order_id, channel
+    ) VALUES (
+        :date_key, :product_sk, :location_sk,
+        :quantity, :unit_price, :discount_pct, :total_amount,
+        :order_id, :channel
+    )
+""")
+
+UPSERT_FACT_INVENTORY = text("""
+    INSERT INTO fact_inventory_snapshot (
+        date_key, product_sk, location_sk,
+        quantity_on_hand, quantity_reserved, quantity_available,
+        reorder_point, safety_stock, days_of_supply,
+        on_hand_value, at_risk_value
+    ) VALUES (
+        :date_key, :product_sk, :location_sk,
+        :qty_on_hand, :qty_reserved, :qty_available,
+        :reorder_point, :safety_stock, :days_of_supply,
+        :on_hand_value, :at_risk_value
+    )
+    ON DUPLICATE KEY UPDATE
+        quantity_on_hand = VALUES(quantity_on_hand),
+        quantity_reserved = VALUES(quantity_reserved),
+        quantity_available = VALUES(quantity_available),
+        days_of_supply = VALUES(days_of_supply),
+        on_hand_value = VALUES(on_hand_value),
+        at_risk_value = VALUES(at_risk_value)
+""")
+
+INSERT_FACT_SHIPMENT = text("""
+    INSERT IGNORE INTO fact_shipment (
+        shipment_date_key, origin_location_sk, destination_location_sk,
+        carrier_sk, shipment_number, status,
+        total_weight_kg, distance_km, transport_mode,
+        cost_usd, co2_emission_kg, units
+    ) VALUES (
+        :ship_date_key, :origin_sk, :dest_sk,
+        :carrier_sk, :shipment_number, :status,
+        :weight, :distance, :mode,
+        :cost, :co2, :units
+    )
+""")
+
+
+# Raw document fields each task reads; everything else stays on the server
+SALES_PROJECTION = dict.fromkeys((
+    "order_id", "product_id", "location_id", "event_date",
+    "quantity", "unit_price", "discount_pct", "total_amount", "channel",
+), 1)
 
+INVENTORY_PROJECTION = dict.fromkeys((
+    "product_id", "location_id",
+    "quantity_on_hand", "quantity_reserved", "quantity_available",
+    "reorder_point", "safety_stock", "days_of_supply",
+), 1)
 
-def compute_idempotency_key(data: dict, keys: list[str]) -> str:
-    """Compute SHA256 hash for idempotency check."""
-    key_data = "".join(str(data.get(k, "")) for k in keys)
-    return hashlib.sha256(key_data.encode()).hexdigest()
+SHIPMENT_PROJECTION = dict.fromkeys((
+    "shipment_number", "shipment_date", "origin_id", "destination_id", "carrier_id",
+    "status", "total_weight_kg", "distance_km", "transport_mode",
+    "cost_usd", "co2_emission_kg", "units",
+), 1)
+
+
+# =============================================================================
+# Dimension Queries
+# =============================================================================
+# Built once at import so every task reuses SQLAlchemy's cached compiled form.
+
+DATE_KEYS_QUERY = text(
+    "SELECT full_date, date_key FROM dim_date WHERE full_date BETWEEN :start AND :end"
+)
+
+PRODUCT_SKS_QUERY = text(
+    "SELECT product_id, product_sk FROM dim_product WHERE is_current = 1"
+)
+
+LOCATION_SKS_QUERY = text(
+    "SELECT location_id, location_sk FROM dim_location WHERE is_current = 1"
+)
+
+CARRIER_SKS_QUERY = text("SELECT carrier_id, carrier_sk FROM dim_carrier")
+
+PRODUCT_PRICES_QUERY = text(
+    "SELECT product_sk, unit_price FROM dim_product WHERE is_current = 1"
+)
 
 
 class BaseIngestionTask(Task):
@@ -107,35 +227,40 @@ def ingest_sales(
             "processed": {"$ne": True},
         }
         
-        cursor = collection.find(query).batch_size(batch_size)
+        cursor = collection.find(query, SALES_PROJECTION).batch_size(batch_size)
         
         processed = 0
         skipped = 0
         errors = 0
         
+        rows: list[dict] = []
+        doc_ids: list = []
+        
         with engine.connect() as conn:
+            # Dimension keys are resolved from in-memory maps, not a SELECT per doc
+            date_keys = _load_date_keys(conn, start_date, end_date)
+            product_sks = _load_product_sks(conn)
+            location_sks = _load_location_sks(conn)
+            
+            # Orders already loaded for this window; INSERT IGNORE still guards
+            # against order IDs that landed under a different date
+            seen_orders = _load_existing_ids(
+                conn, "fact_sales", "order_id", "date_key", date_keys.values()
+            )
+            
             for doc in cursor:
                 try:
-                    # Compute idempotency key
-                    idem_key = compute_idempotency_key(
-                        doc,
-                        ["order_id", "product_id", "location_id", "event_date"],
-                    )
-                    
-                    # Check if already processed
-                    existing = conn.execute(
-                        text("SELECT 1 FROM fact_sales WHERE order_id = :order_id LIMIT 1"),
-                        {"order_id": doc.get("order_id")},
-                    ).fetchone()
-                    
-                    if existing:
+                    order_id = doc.get("order_id")
+                    if order_id is not None and order_id in seen_orders:
+                        # Already loaded; still acknowledge it in the next flush
+                        doc_ids.append(doc["_id"])
                         skipped += 1
                         continue
                     
                     # Get dimension keys
-                    date_key = _get_date_key(conn, doc.get("event_date"))
-                    product_sk = _get_product_sk(conn, doc.get("product_id"))
-                    location_sk = _get_location_sk(conn, doc.get("location_id"))
+                    date_key = date_keys.get(doc.get("event_date"))
+                    product_sk = product_sks.get(doc.get("product_id"))
+                    location_sk = location_sks.get(doc.get("location_id"))
                     
                     if not all([date_key, product_sk, location_sk]):
                         logger.warning(
@@ -145,56 +270,35 @@ def ingest_sales(
                         errors += 1
                         continue
                     
-                    # Insert into fact table
-                    conn.execute(
-                        text("""
-                            INSERT INTO fact_sales (
-                                date_key, product_sk, location_sk,
-                                quantity, unit_price, discount_pct, total_amount,
-                                order_id, channel
-                            ) VALUES (
-                                :date_key, :product_sk, :location_sk,
-                                :quantity, :unit_price, :discount_pct, :total_amount,
-                                :order_id, :channel
-                            )
-                        """),
-                        {
-                            "date_key": date_key,
-                            "product_sk": product_sk,
-                            "location_sk": location_sk,
-                            "quantity": doc.get("quantity", 0),
-                            "unit_price": doc.get("unit_price", 0),
-                            "discount_pct": doc.get("discount_pct", 0),
-                            "total_amount": doc.get("total_amount", 0),
-                            "order_id": doc.get("order_id"),
-                            "channel": doc.get("channel"),
-                        },
-                    )
-                    
-                    # Mark as processed in MongoDB
-                    collection.update_one(
-                        {"_id": doc["_id"]},
-                        {
-                            "$set": {
-                                "processed": True,
-                                "processed_at": datetime.now(timezone.utc),
-                            }
-                        },
-                    )
-                    
-                    processed += 1
-                    
-                    # Commit periodically
-                    if processed % batch_size == 0:
-                        conn.commit()
-                        logger.info("batch_committed", processed=processed)
+                    rows.append({
+                        "date_key": date_key,
+                        "product_sk": product_sk,
+                        "location_sk": location_sk,
+                        "quantity": doc.get("quantity", 0),
+                        "unit_price": doc.get("unit_price", 0),
+                        "discount_pct": doc.get("discount_pct", 0),
+                        "total_amount": doc.get("total_amount", 0),
+                        "order_id": order_id,
+                        "channel": doc.get("channel"),
+                    })
+                    doc_ids.append(doc["_id"])
+                    if order_id is not None:
+                        seen_orders.add(order_id)
                 
                 except Exception as e:
                     logger.error("record_error", error=str(e))
                     errors += 1
                     continue
+                
+                if len(doc_ids) >= batch_size:
+                    queued, written = _flush_batch(conn, collection, INSERT_FACT_SALES, rows, doc_ids)
+                    processed += written
+                    skipped += queued - written
+                    logger.info("batch_committed", processed=processed)
             
-            conn.commit()
+            queued, written = _flush_batch(conn, collection, INSERT_FACT_SALES, rows, doc_ids)
+            processed += written
+            skipped += queued - written
         
         stats = {
             "processed": processed,
@@ -209,7 +313,6 @@ def ingest_sales(
     
     finally:
         mongo.close()
-        engine.dispose()
 
 
 @app.task(bind=True, base=BaseIngestionTask, name="tasks.raw_to_curated.ingest_inventory")
@@ -242,71 +345,66 @@ def ingest_inventory(
             "processed": {"$ne": True},
         }
         
-        cursor = collection.find(query).batch_size(batch_size)
+        cursor = collection.find(query, INVENTORY_PROJECTION).batch_size(batch_size)
         
         processed = 0
         errors = 0
         
+        rows: list[dict] = []
+        doc_ids: list = []
+        
         with engine.connect() as conn:
+            date_key = _load_date_keys(conn, snapshot_date, snapshot_date).get(snapshot_date)
+            product_sks = _load_product_sks(conn)
+            location_sks = _load_location_sks(conn)
+            product_prices = _load_product_prices(conn)
+            
             for doc in cursor:
                 try:
-                    date_key = _get_date_key(conn, snapshot_date)
-                    product_sk = _get_product_sk(conn, doc.get("product_id"))
-                    location_sk = _get_location_sk(conn, doc.get("location_id"))
+                    product_sk = product_sks.get(doc.get("product_id"))
+                    location_sk = location_sks.get(doc.get("location_id"))
                     
                     if not all([date_key, product_sk, location_sk]):
                         errors += 1
                         continue
                     
-                    # Upsert inventory snapshot
-                    conn.execute(
-                        text("""
-                            INSERT INTO fact_inventory_snapshot (
-                                date_key, product_sk, location_sk,
-                                quantity_on_hand, quantity_reserved, quantity_available,
-                                reorder_point, safety_stock, days_of_supply
-                            ) VALUES (
-                                :date_key, :product_sk, :location_sk,
-                                :qty_on_hand, :qty_reserved, :qty_available,
-                                :reorder_point, :safety_stock, :days_of_supply
-                            )
-                            ON DUPLICATE KEY UPDATE
-                                quantity_on_hand = VALUES(quantity_on_hand),
-                                quantity_reserved = VALUES(quantity_reserved),
-                                quantity_available = VALUES(quantity_available),
-                                days_of_supply = VALUES(days_of_supply)
-                        """),
-                        {
-                            "date_key": date_key,
-                            "product_sk": product_sk,
-                            "location_sk": location_sk,
-                            "qty_on_hand": doc.get("quantity_on_hand", 0),
-                            "qty_reserved": doc.get("quantity_reserved", 0),
-                            "qty_available": doc.get("quantity_available", 0),
-                            "reorder_point": doc.get("reorder_point"),
-                            "safety_stock": doc.get("safety_stock"),
-                            "days_of_supply": doc.get("days_of_supply"),
-                        },
-                    )
-                    
-                    collection.update_one(
-                        {"_id": doc["_id"]},
-                        {"$set": {"processed": True}},
-                    )
+                    # Valued once at load time so reads just SUM() the columns
+                    unit_price = product_prices.get(product_sk) or 0
+                    qty_on_hand = doc.get("quantity_on_hand", 0)
+                    qty_available = doc.get("quantity_available", 0)
+                    safety_stock = doc.get("safety_stock")
+                    below_safety = safety_stock is not None and qty_available < safety_stock
                     
-                    processed += 1
+                    rows.append({
+                        "date_key": date_key,
+                        "product_sk": product_sk,
+                        "location_sk": location_sk,
+                        "qty_on_hand": qty_on_hand,
+                        "qty_reserved": doc.get("quantity_reserved", 0),
+                        "qty_available": qty_available,
+                        "reorder_point": doc.get("reorder_point"),
+                        "safety_stock": safety_stock,
+                        "days_of_supply": doc.get("days_of_supply"),
+                        "on_hand_value": qty_on_hand * unit_price,
+                        # Stock below safety stock, the data quality low-stock rule
+                        "at_risk_value": qty_available * unit_price if below_safety else 0,
+                    })
+                    doc_ids.append(doc["_id"])
                     
                 except Exception as e:
                     logger.error("inventory_record_error", error=str(e))
                     errors += 1
+                    continue
+                
+                if len(rows) >= batch_size:
+                    processed += _flush_batch(conn, collection, UPSERT_FACT_INVENTORY, rows, doc_ids)[0]
             
-            conn.commit()
+            processed += _flush_batch(conn, collection, UPSERT_FACT_INVENTORY, rows, doc_ids)[0]
         
         return {"processed": processed, "errors": errors}
     
     finally:
         mongo.close()
-        engine.dispose()
 
 
 @app.task(bind=True, base=BaseIngestionTask, name="tasks.raw_to_curated.ingest_shipments")
@@ -345,125 +443,176 @@ def ingest_shipments(
             "processed": {"$ne": True},
         }
         
-        cursor = collection.find(query).batch_size(batch_size)
+        cursor = collection.find(query, SHIPMENT_PROJECTION).batch_size(batch_size)
         
         processed = 0
+        skipped = 0
         errors = 0
         
+        rows: list[dict] = []
+        doc_ids: list = []
+        
         with engine.connect() as conn:
+            date_keys = _load_date_keys(conn, start_date, end_date)
+            location_sks = _load_location_sks(conn)
+            carrier_sks = _load_carrier_sks(conn)
+            seen_shipments = _load_existing_ids(
+                conn, "fact_shipment", "shipment_number", "shipment_date_key", date_keys.values()
+            )
+            
             for doc in cursor:
                 try:
-                    # Get dimension keys
-                    ship_date_key = _get_date_key(conn, doc.get("shipment_date"))
-                    origin_sk = _get_location_sk(conn, doc.get("origin_id"))
-                    dest_sk = _get_location_sk(conn, doc.get("destination_id"))
-                    carrier_sk = _get_carrier_sk(conn, doc.get("carrier_id"))
-                    
-                    if not all([ship_date_key, origin_sk, dest_sk, carrier_sk]):
+                    shipment_number = doc.get("shipment_number")
+                    if shipment_number is None:
+                        # fact_shipment.shipment_number is NOT NULL
+                        logger.warning(
+                            "missing_shipment_number",
+                            doc_id=str(doc.get("_id")),
+                        )
                         errors += 1
                         continue
                     
-                    # Check duplicate by shipment number
-                    existing = conn.execute(
-                        text("SELECT 1 FROM fact_shipment WHERE shipment_number = :sn LIMIT 1"),
-                        {"sn": doc.get("shipment_number")},
-                    ).fetchone()
-                    
-                    if existing:
+                    if shipment_number in seen_shipments:
+                        # Already loaded; still acknowledge it in the next flush
+                        doc_ids.append(doc["_id"])
+                        skipped += 1
                         continue
                     
-                    conn.execute(
-                        text("""
-                            INSERT INTO fact_shipment (
-                                shipment_date_key, origin_location_sk, destination_location_sk,
-                                carrier_sk, shipment_number, status,
-                                total_weight_kg, distance_km, transport_mode,
-                                cost_usd, co2_emission_kg
-                            ) VALUES (
-                                :ship_date_key, :origin_sk, :dest_sk,
-                                :carrier_sk, :shipment_number, :status,
-                                :weight, :distance, :mode,
-                                :cost, :co2
-                            )
-                        """),
-                        {
-                            "ship_date_key": ship_date_key,
-                            "origin_sk": origin_sk,
-                            "dest_sk": dest_sk,
-                            "carrier_sk": carrier_sk,
-                            "shipment_number": doc.get("shipment_number"),
-                            "status": doc.get("status", "pending"),
-                            "weight": doc.get("total_weight_kg"),
-                            "distance": doc.get("distance_km"),
-                            "mode": doc.get("transport_mode"),
-                            "cost": doc.get("cost_usd"),
-                            "co2": doc.get("co2_emission_kg"),
-                        },
-                    )
+                    # Get dimension keys
+                    ship_date_key = date_keys.get(doc.get("shipment_date"))
+                    origin_sk = location_sks.get(doc.get("origin_id"))
+                    dest_sk = location_sks.get(doc.get("destination_id"))
+                    carrier_sk = carrier_sks.get(doc.get("carrier_id"))
                     
-                    collection.update_one(
-                        {"_id": doc["_id"]},
-                        {"$set": {"processed": True}},
-                    )
+                    if not all([ship_date_key, origin_sk, dest_sk, carrier_sk]):
+                        errors += 1
+                        continue
                     
-                    processed += 1
+                    rows.append({
+                        "ship_date_key": ship_date_key,
+                        "origin_sk": origin_sk,
+                        "dest_sk": dest_sk,
+                        "carrier_sk": carrier_sk,
+                        "shipment_number": shipment_number,
+                        "status": doc.get("status", "pending"),
+                        "weight": doc.get("total_weight_kg"),
+                        "distance": doc.get("distance_km"),
+                        "mode": doc.get("transport_mode"),
+                        "cost": doc.get("cost_usd"),
+                        "co2": doc.get("co2_emission_kg"),
+                        "units": doc.get("units"),
+                    })
+                    doc_ids.append(doc["_id"])
+                    seen_shipments.add(shipment_number)
                     
                 except Exception as e:
                     logger.error("shipment_record_error", error=str(e))
                     errors += 1
+                    continue
+                
+                if len(doc_ids) >= batch_size:
+                    queued, written = _flush_batch(conn, collection, INSERT_FACT_SHIPMENT, rows, doc_ids)
+                    processed += written
+                    skipped += queued - written
             
-            conn.commit()
+            queued, written = _flush_batch(conn, collection, INSERT_FACT_SHIPMENT, rows, doc_ids)
+            processed += written
+            skipped += queued - written
         
-        return {"processed": processed, "errors": errors}
+        return {"processed": processed, "skipped": skipped, "errors": errors}
     
     finally:
         mongo.close()
-        engine.dispose()
 
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
-def _get_date_key(conn, date_str: str) -> int | None:
-    """Get date_key from dim_date for a given date string."""
-    if not date_str:
-        return None
-    result = conn.execute(
-        text("SELECT date_key FROM dim_date WHERE full_date = :d LIMIT 1"),
-        {"d": date_str},
-    ).fetchone()
-    return result[0] if result else None
+def _flush_batch(
+    conn,
+    collection,
+    statement,
+    rows: list[dict],
+    doc_ids: list,
+) -> tuple[int, int]:
+    """
+    Write a batch of fact rows in one round-trip and mark the source docs processed.
+    
+    MySQL is committed before MongoDB is updated, so a failed insert never
+    leaves raw documents flagged as processed; the whole batch is then
+    acknowledged with a single update_many. doc_ids may also carry documents
+    that were skipped as already loaded, so they are acknowledged even when
+    there are no rows to write. Both lists are cleared.
+    
+    Returns:
+        (rows queued, rows reported written by MySQL); for INSERT IGNORE the
+        difference is the number of duplicates dropped
+    """
+    if not doc_ids:
+        return 0, 0
+    
+    written = 0
+    if rows:
+        written = conn.execute(statement, rows).rowcount
+        conn.commit()
+    collection.update_many(
+        {"_id": {"$in": doc_ids}},
+        {"$set": {"processed": True, "processed_at": datetime.now(timezone.utc)}},
+    )
+    
+    queued = len(rows)
+    rows.clear()
+    doc_ids.clear()
+    return queued, written
 
 
-def _get_product_sk(conn, product_id: str) -> int | None:
-    """Get product_sk from dim_product for a given product_id."""
-    if not product_id:
-        return None
-    result = conn.execute(
-        text("SELECT product_sk FROM dim_product WHERE product_id = :pid AND is_current = 1 LIMIT 1"),
-        {"pid": product_id},
-    ).fetchone()
-    return result[0] if result else None
+def _load_date_keys(conn, start_date: str, end_date: str) -> dict[str, int]:
+    """Map YYYY-MM-DD strings to dim_date keys for an inclusive date range."""
+    result = conn.execute(DATE_KEYS_QUERY, {"start": start_date, "end": end_date})
+    return {str(full_date): date_key for full_date, date_key in result}
 
 
-def _get_location_sk(conn, location_id: str) -> int | None:
-    """Get location_sk from dim_location for a given location_id."""
-    if not location_id:
-        return None
+def _load_existing_ids(conn, table: str, id_column: str, date_column: str, date_keys) -> set:
+    """
+    Load the business IDs already present in a fact table for a date-key window.
+    
+    Table and column names are internal constants, never user input.
+    """
+    date_keys = list(date_keys)
+    if not date_keys:
+        return set()
+    
     result = conn.execute(
-        text("SELECT location_sk FROM dim_location WHERE location_id = :lid AND is_current = 1 LIMIT 1"),
-        {"lid": location_id},
-    ).fetchone()
-    return result[0] if result else None
+        text(f"""
+            SELECT {id_column} FROM {table}
+            WHERE {date_column} BETWEEN :first AND :last
+            AND {id_column} IS NOT NULL
+        """),
+        {"first": min(date_keys), "last": max(date_keys)},
+    )
+    return {row[0] for row in result}
 
 
-def _get_carrier_sk(conn, carrier_id: str) -> int | None:
-    """Get carrier_sk from dim_carrier for a given carrier_id."""
-    if not carrier_id:
-        return None
-    result = conn.execute(
-        text("SELECT carrier_sk FROM dim_carrier WHERE carrier_id = :cid LIMIT 1"),
-        {"cid": carrier_id},
-    ).fetchone()
-    return result[0] if result else None
+def _load_product_sks(conn) -> dict[str, int]:
+    """Map product_id to the current product_sk in dim_product."""
+    result = conn.execute(PRODUCT_SKS_QUERY)
+    return {product_id: product_sk for product_id, product_sk in result}
+
+
+def _load_location_sks(conn) -> dict[str, int]:
+    """Map location_id to the current location_sk in dim_location."""
+    result = conn.execute(LOCATION_SKS_QUERY)
+    return {location_id: location_sk for location_id, location_sk in result}
+
+
+def _load_product_prices(conn) -> dict[int, Any]:
+    """Map current product_sk to its unit_price in dim_product."""
+    result = conn.execute(PRODUCT_PRICES_QUERY)
+    return {product_sk: unit_price for product_sk, unit_price in result}
+
+
+def _load_carrier_sks(conn) -> dict[str, int]:
+    """Map carrier_id to carrier_sk in dim_carrier."""
+    result = conn.execute(CARRIER_SKS_QUERY)
+    return {carrier_id: carrier_sk for carrier_id, carrier_sk in result}
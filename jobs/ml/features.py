@@ -88,23 +88,30 @@ def add_holiday_features(df: pd.DataFrame, country: str = "US") -> pd.DataFrame:
     years = df["date"].dt.year.unique()
     country_holidays = holidays.country_holidays(country, years=years)
     
-    df["is_holiday"] = df["date"].dt.date.apply(lambda x: x in country_holidays).astype(int)
+    # Work in day ordinals so the lookups below are vectorised
+    holiday_days = np.array(sorted(country_holidays.keys()), dtype="datetime64[D]").astype(np.int64)
+    days = df["date"].values.astype("datetime64[D]").astype(np.int64)
     
-    # Days until next holiday / since last holiday
-    holiday_dates = sorted(country_holidays.keys())
-    
-    def days_to_holiday(date):
-        date = date.date() if hasattr(date, "date") else date
-        future = [h for h in holiday_dates if h > date]
-        return (future[0] - date).days if future else 999
+    df["is_holiday"] = np.isin(days, holiday_days).astype(int)
     
-    def days_since_holiday(date):
-        date = date.date() if hasattr(date, "date") else date
-        past = [h for h in holiday_dates if h < date]
-        return (date - past[-1]).days if past else 999
-    
-    df["days_to_holiday"] = df["date"].apply(days_to_holiday)
-    df["days_since_holiday"] = df["date"].apply(days_since_holiday)
+    # Days until next holiday / since last holiday
+    if len(holiday_days) == 0:
+        df["days_to_holiday"] = 999
+        df["days_since_holiday"] = 999
+    else:
+        next_idx = np.searchsorted(holiday_days, days, side="right")
+        prev_idx = np.searchsorted(holiday_days, days, side="left") - 1
+        
+        df["days_to_holiday"] = np.where(
+            next_idx < len(holiday_days),
+            holiday_days[np.minimum(next_idx, len(holiday_days) - 1)] - days,
+            999,
+        )
+        df["days_since_holiday"] = np.where(
+            prev_idx >= 0,
+            days - holiday_days[np.maximum(prev_idx, 0)],
+            999,
+        )
     
     # Cap extreme values
     df["days_to_holiday"] = df["days_to_holiday"].clip(upper=30)
@@ -123,10 +130,10 @@ def add_lag_features(df: pd.DataFrame, group_cols: list = None) -> pd.DataFrame:
     for lag in lags:
         df[f"qty_lag_{lag}d"] = df.groupby(group_cols)["quantity"].shift(lag)
     
-    # Same day last week
-    df["qty_same_dow_1w"] = df.groupby(group_cols)["quantity"].shift(7)
-    df["qty_same_dow_2w"] = df.groupby(group_cols)["quantity"].shift(14)
-    df["qty_same_dow_4w"] = df.groupby(group_cols)["quantity"].shift(28)
+    # Same day last week (identical to the weekly lags computed above)
+    df["qty_same_dow_1w"] = df["qty_lag_7d"]
+    df["qty_same_dow_2w"] = df["qty_lag_14d"]
+    df["qty_same_dow_4w"] = df["qty_lag_28d"]
     
     return df
 
@@ -137,29 +144,26 @@ def add_rolling_features(df: pd.DataFrame, group_cols: list = None) -> pd.DataFr
         group_cols = ["product_id", "location_id"]
     
     windows = [7, 14, 28]
+    stats = ["mean", "std", "min", "max"]
+    
+    # Shift once, then run every window through pandas' grouped rolling
+    # kernels on a positional index so results line up with df row-for-row
+    shifted = pd.Series(
+        df.groupby(group_cols)["quantity"].shift(1).to_numpy(),
+        index=pd.RangeIndex(len(df)),
+    )
+    keys = [df[c].to_numpy() for c in group_cols]
     
     for window in windows:
-        # Rolling mean
-        df[f"qty_rolling_mean_{window}d"] = (
-            df.groupby(group_cols)["quantity"]
-            .transform(lambda x: x.shift(1).rolling(window, min_periods=1).mean())
-        )
-        
-        # Rolling std
-        df[f"qty_rolling_std_{window}d"] = (
-            df.groupby(group_cols)["quantity"]
-            .transform(lambda x: x.shift(1).rolling(window, min_periods=1).std())
-        )
-        
-        # Rolling min/max
-        df[f"qty_rolling_min_{window}d"] = (
-            df.groupby(group_cols)["quantity"]
-            .transform(lambda x: x.shift(1).rolling(window, min_periods=1).min())
-        )
-        df[f"qty_rolling_max_{window}d"] = (
-            df.groupby(group_cols)["quantity"]
-            .transform(lambda x: x.shift(1).rolling(window, min_periods=1).max())
+        rolled = (
+            shifted.groupby(keys)
+            .rolling(window, min_periods=1)
+            .agg(stats)
+            .droplevel(list(range(len(group_cols))))
+            .reindex(shifted.index)
         )
+        for stat in stats:
+            df[f"qty_rolling_{stat}_{window}d"] = rolled[stat].to_numpy()
     
     # Fill NaN std with 0
     std_cols = [c for c in df.columns if "rolling_std" in c]
@@ -0,0 +1,40 @@
+"""Unique order_id on fact_sales for idempotent ingestion
+
+Revision ID: 002_fact_sales_order_id_unique
+Revises: 001_initial
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002_fact_sales_order_id_unique'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enforce one fact_sales row per order_id (NULLs are still allowed)."""
+    # Ingestion relies on INSERT IGNORE against this index instead of a
+    # per-row existence check; fact_shipment.shipment_number is already unique.
+    # Earlier loads could repeat an order, so keep its first row (lowest
+    # sales_id) and drop the rest before the index is built.
+    op.execute("""
+        DELETE fs FROM fact_sales fs
+        JOIN (
+            SELECT order_id, MIN(sales_id) AS keep_id
+            FROM fact_sales
+            WHERE order_id IS NOT NULL
+            GROUP BY order_id
+            HAVING COUNT(*) > 1
+        ) dup ON fs.order_id = dup.order_id AND fs.sales_id > dup.keep_id
+    """)
+    op.create_index('ux_fact_sales_order_id', 'fact_sales', ['order_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the order_id unique index (deduplicated rows are not restored)."""
+    op.drop_index('ux_fact_sales_order_id', table_name='fact_sales')
@@ -0,0 +1,42 @@
+"""Indexes backing the data quality check queries
+
+Revision ID: 003_quality_check_indexes
+Revises: 002_fact_sales_order_id_unique
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '003_quality_check_indexes'
+down_revision: Union[str, None] = '002_fact_sales_order_id_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add indexes so the quality checks run as index range scans."""
+    # Negative-quantity check (fact_sales.order_id is already covered by
+    # ux_fact_sales_order_id from 002)
+    op.create_index('ix_fact_sales_quantity', 'fact_sales', ['quantity'])
+
+    # Low/critical stock on the latest snapshot: covers the whole scan
+    op.create_index(
+        'ix_fact_inventory_date_stock',
+        'fact_inventory_snapshot',
+        ['date_key', 'quantity_available', 'safety_stock', 'days_of_supply'],
+    )
+
+    # Stale production models; supersedes the single-column status index
+    op.create_index('ix_ml_model_status_trained', 'ml_model', ['status', 'trained_at'])
+    op.drop_index('ix_ml_model_status', table_name='ml_model')
+
+
+def downgrade() -> None:
+    """Drop the quality check indexes."""
+    op.create_index('ix_ml_model_status', 'ml_model', ['status'])
+    op.drop_index('ix_ml_model_status_trained', table_name='ml_model')
+    op.drop_index('ix_fact_inventory_date_stock', table_name='fact_inventory_snapshot')
+    op.drop_index('ix_fact_sales_quantity', table_name='fact_sales')
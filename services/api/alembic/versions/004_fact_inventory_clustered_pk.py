@@ -0,0 +1,51 @@
+"""Cluster fact_inventory_snapshot on its snapshot grain
+
+Revision ID: 004_fact_inventory_clustered_pk
+Revises: 003_quality_check_indexes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_fact_inventory_clustered_pk'
+down_revision: Union[str, None] = '003_quality_check_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Make (date_key, product_sk, location_sk) the clustered primary key."""
+    # InnoDB stores rows in primary key order, so every inventory endpoint's
+    # date_key filter becomes one contiguous range read instead of a
+    # secondary-index probe per row. snapshot_id stays unique so the
+    # AUTO_INCREMENT column remains indexed.
+    op.execute("""
+        ALTER TABLE fact_inventory_snapshot
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (date_key, product_sk, location_sk),
+            ADD UNIQUE KEY ux_fact_inventory_snapshot_id (snapshot_id)
+    """)
+
+    # Both are now leftmost prefixes of the primary key
+    op.drop_constraint('uq_inventory_snapshot', 'fact_inventory_snapshot', type_='unique')
+    op.drop_index('ix_fact_inventory_date_key', table_name='fact_inventory_snapshot')
+
+
+def downgrade() -> None:
+    """Restore the surrogate snapshot_id primary key."""
+    op.create_index('ix_fact_inventory_date_key', 'fact_inventory_snapshot', ['date_key'])
+    op.create_unique_constraint(
+        'uq_inventory_snapshot',
+        'fact_inventory_snapshot',
+        ['date_key', 'product_sk', 'location_sk'],
+    )
+
+    op.execute("""
+        ALTER TABLE fact_inventory_snapshot
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (snapshot_id),
+            DROP INDEX ux_fact_inventory_snapshot_id
+    """)
@@ -0,0 +1,88 @@
+"""Populate dim_date with the calendar used by ingestion and the API
+
+Revision ID: 005_populate_dim_date
+Revises: 004_fact_inventory_clustered_pk
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_populate_dim_date'
+down_revision: Union[str, None] = '004_fact_inventory_clustered_pk'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CALENDAR_START = date(2010, 1, 1)
+CALENDAR_END = date(2040, 12, 31)
+
+# Rows per multi-row INSERT, well inside max_allowed_packet
+INSERT_CHUNK_ROWS = 1000
+
+dim_date = sa.table(
+    'dim_date',
+    sa.column('date_key', sa.Integer),
+    sa.column('full_date', sa.Date),
+    sa.column('day_of_week', sa.SmallInteger),
+    sa.column('day_of_month', sa.SmallInteger),
+    sa.column('day_of_year', sa.SmallInteger),
+    sa.column('week_of_year', sa.SmallInteger),
+    sa.column('month', sa.SmallInteger),
+    sa.column('quarter', sa.SmallInteger),
+    sa.column('year', sa.SmallInteger),
+    sa.column('is_weekend', sa.Boolean),
+    sa.column('is_holiday', sa.Boolean),
+)
+
+
+def _date_key(day: date) -> int:
+    """YYYYMMDD integer key, as built by the API endpoints."""
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _calendar_rows():
+    """Yield one dim_date row per day; day_of_week is Monday == 0."""
+    day = CALENDAR_START
+    while day <= CALENDAR_END:
+        weekday = day.weekday()
+        yield {
+            'date_key': _date_key(day),
+            'full_date': day,
+            'day_of_week': weekday,
+            'day_of_month': day.day,
+            'day_of_year': day.timetuple().tm_yday,
+            'week_of_year': day.isocalendar()[1],
+            'month': day.month,
+            'quarter': (day.month - 1) // 3 + 1,
+            'year': day.year,
+            'is_weekend': weekday >= 5,
+            'is_holiday': False,
+        }
+        day += timedelta(days=1)
+
+
+def upgrade() -> None:
+    """Insert every calendar day between CALENDAR_START and CALENDAR_END."""
+    # Fiscal columns stay NULL: there is no fiscal calendar defined yet
+    rows = []
+    for row in _calendar_rows():
+        rows.append(row)
+        if len(rows) == INSERT_CHUNK_ROWS:
+            op.bulk_insert(dim_date, rows, multiinsert=True)
+            rows = []
+
+    if rows:
+        op.bulk_insert(dim_date, rows, multiinsert=True)
+
+
+def downgrade() -> None:
+    """Remove the generated calendar days."""
+    op.execute(
+        dim_date.delete().where(
+            dim_date.c.date_key.between(_date_key(CALENDAR_START), _date_key(CALENDAR_END))
+        )
+    )
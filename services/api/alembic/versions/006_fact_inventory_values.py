@@ -0,0 +1,35 @@
+"""Store inventory values on fact_inventory_snapshot
+
+Revision ID: 006_fact_inventory_values
+Revises: 005_populate_dim_date
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_fact_inventory_values'
+down_revision: Union[str, None] = '005_populate_dim_date'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add on-hand and at-risk values, priced by ingestion at load time."""
+    op.add_column(
+        'fact_inventory_snapshot',
+        sa.Column('on_hand_value', sa.Numeric(15, 2), nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'fact_inventory_snapshot',
+        sa.Column('at_risk_value', sa.Numeric(15, 2), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the stored inventory values."""
+    op.drop_column('fact_inventory_snapshot', 'at_risk_value')
+    op.drop_column('fact_inventory_snapshot', 'on_hand_value')
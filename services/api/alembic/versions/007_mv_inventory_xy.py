@@ -0,0 +1,37 @@
+"""Summary table backing the inventory risk heatmap
+
+Revision ID: 007_mv_inventory_xy
+Revises: 006_fact_inventory_values
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_mv_inventory_xy'
+down_revision: Union[str, None] = '006_fact_inventory_values'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create mv_inventory_xy, refreshed by tasks.aggregations.refresh_materialized_views."""
+    # Clustered on (date_key, region, category): the heatmap reads one
+    # date_key as a single primary key range with no joins
+    op.create_table(
+        'mv_inventory_xy',
+        sa.Column('date_key', sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column('region', sa.String(100), primary_key=True),
+        sa.Column('category', sa.String(100), primary_key=True),
+        sa.Column('at_risk_units', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('days_of_supply_sum', sa.Numeric(18, 2), nullable=True),
+        sa.Column('days_of_supply_count', sa.Integer, nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Drop mv_inventory_xy."""
+    op.drop_table('mv_inventory_xy')
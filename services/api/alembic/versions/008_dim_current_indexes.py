@@ -0,0 +1,36 @@
+"""Covering indexes for the current-row dimension lookups
+
+Revision ID: 008_dim_current_indexes
+Revises: 007_mv_inventory_xy
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '008_dim_current_indexes'
+down_revision: Union[str, None] = '007_mv_inventory_xy'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cover the ingestion id -> sk map loads and drop duplicate id indexes."""
+    # Ingestion loads every current row as (id, sk); InnoDB secondary indexes
+    # carry the primary key, so (is_current, id) answers it index-only
+    op.create_index('ix_dim_product_current', 'dim_product', ['is_current', 'product_id'])
+    op.create_index('ix_dim_location_current', 'dim_location', ['is_current', 'location_id'])
+
+    # product_id and location_id are already UNIQUE, which has its own index
+    op.drop_index('ix_dim_product_product_id', table_name='dim_product')
+    op.drop_index('ix_dim_location_location_id', table_name='dim_location')
+
+
+def downgrade() -> None:
+    """Restore the single-column id indexes."""
+    op.create_index('ix_dim_location_location_id', 'dim_location', ['location_id'])
+    op.create_index('ix_dim_product_product_id', 'dim_product', ['product_id'])
+    op.drop_index('ix_dim_location_current', table_name='dim_location')
+    op.drop_index('ix_dim_product_current', table_name='dim_product')
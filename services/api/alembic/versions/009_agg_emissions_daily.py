@@ -0,0 +1,42 @@
+"""Daily emissions pre-aggregate backing the sustainability endpoints
+
+Revision ID: 009_agg_emissions_daily
+Revises: 008_dim_current_indexes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_agg_emissions_daily'
+down_revision: Union[str, None] = '008_dim_current_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create agg_emissions_daily, refreshed by tasks.aggregations.refresh_materialized_views."""
+    # One row per (day, mode, destination region, route): every emissions
+    # endpoint re-groups this instead of scanning fact_shipment
+    op.create_table(
+        'agg_emissions_daily',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('date_key', sa.Integer, nullable=False),
+        sa.Column('mode', sa.String(20), nullable=True),
+        sa.Column('region', sa.String(100), nullable=True),
+        sa.Column('from_name', sa.String(200), nullable=True),
+        sa.Column('to_name', sa.String(200), nullable=True),
+        sa.Column('shipments', sa.Integer, nullable=False),
+        sa.Column('total_co2_kg', sa.Numeric(18, 4), nullable=False),
+        sa.Column('total_units', sa.Integer, nullable=False),
+        sa.Column('total_distance_km', sa.Numeric(18, 2), nullable=False),
+        sa.Index('ix_agg_emissions_daily_date_key', 'date_key'),
+    )
+
+
+def downgrade() -> None:
+    """Drop agg_emissions_daily."""
+    op.drop_table('agg_emissions_daily')
@@ -0,0 +1,41 @@
+"""Covering index for the emissions rollup over fact_shipment
+
+Revision ID: 010_fact_shipment_emissions_index
+Revises: 009_agg_emissions_daily
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '010_fact_shipment_emissions_index'
+down_revision: Union[str, None] = '009_agg_emissions_daily'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cover the date-range emissions scan and drop the index it prefixes."""
+    # The agg_emissions_daily refresh reads a trailing date range and only
+    # these columns, so the whole scan is answered from the index
+    op.create_index(
+        'ix_fact_shipment_date_emissions',
+        'fact_shipment',
+        [
+            'shipment_date_key',
+            'carrier_sk',
+            'origin_location_sk',
+            'destination_location_sk',
+            'co2_emission_kg',
+            'distance_km',
+        ],
+    )
+    op.drop_index('ix_fact_shipment_date_key', table_name='fact_shipment')
+
+
+def downgrade() -> None:
+    """Restore the single-column date index."""
+    op.create_index('ix_fact_shipment_date_key', 'fact_shipment', ['shipment_date_key'])
+    op.drop_index('ix_fact_shipment_date_emissions', table_name='fact_shipment')
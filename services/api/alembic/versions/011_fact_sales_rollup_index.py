@@ -0,0 +1,45 @@
+"""Covering index for the daily sales rollups over fact_sales
+
+Revision ID: 011_fact_sales_rollup_index
+Revises: 010_fact_shipment_emissions_index
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '011_fact_sales_rollup_index'
+down_revision: Union[str, None] = '010_fact_shipment_emissions_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cover the per-day sales aggregation and drop the indexes it prefixes."""
+    # aggregate_daily_sales and the KPI sales trend read one day (or a
+    # trailing range) and only these columns, so InnoDB answers them from
+    # the index instead of materialising the full fact rows
+    op.create_index(
+        'ix_fact_sales_date_rollup',
+        'fact_sales',
+        [
+            'date_key',
+            'product_sk',
+            'location_sk',
+            'order_id',
+            'quantity',
+            'total_amount',
+            'unit_price',
+        ],
+    )
+    op.drop_index('ix_fact_sales_date_product', table_name='fact_sales')
+    op.drop_index('ix_fact_sales_date_key', table_name='fact_sales')
+
+
+def downgrade() -> None:
+    """Restore the date and date/product indexes."""
+    op.create_index('ix_fact_sales_date_key', 'fact_sales', ['date_key'])
+    op.create_index('ix_fact_sales_date_product', 'fact_sales', ['date_key', 'product_sk'])
+    op.drop_index('ix_fact_sales_date_rollup', table_name='fact_sales')
@@ -0,0 +1,27 @@
+"""Store shipped units on fact_shipment
+
+Revision ID: 012_fact_shipment_units
+Revises: 011_fact_sales_rollup_index
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012_fact_shipment_units'
+down_revision: Union[str, None] = '011_fact_sales_rollup_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the shipped unit count summed into agg_emissions_daily.total_units."""
+    op.add_column('fact_shipment', sa.Column('units', sa.Integer, nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the shipped unit count."""
+    op.drop_column('fact_shipment', 'units')
@@ -0,0 +1,54 @@
+"""Rebuild the emissions covering index over the columns the rollup reads
+
+Revision ID: 013_fact_shipment_emissions_index_units
+Revises: 012_fact_shipment_units
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '013_fact_shipment_emissions_index_units'
+down_revision: Union[str, None] = '012_fact_shipment_units'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Cover every column of the agg_emissions_daily refresh, units included."""
+    # The refresh takes mode from transport_mode rather than joining
+    # dim_carrier, and sums the units added in 012, so the 010 index
+    # (carrier_sk, no units) still sent each row back to the clustered index
+    op.drop_index('ix_fact_shipment_date_emissions', table_name='fact_shipment')
+    op.create_index(
+        'ix_fact_shipment_date_emissions',
+        'fact_shipment',
+        [
+            'shipment_date_key',
+            'transport_mode',
+            'origin_location_sk',
+            'destination_location_sk',
+            'co2_emission_kg',
+            'units',
+            'distance_km',
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Restore the 010 index definition."""
+    op.drop_index('ix_fact_shipment_date_emissions', table_name='fact_shipment')
+    op.create_index(
+        'ix_fact_shipment_date_emissions',
+        'fact_shipment',
+        [
+            'shipment_date_key',
+            'carrier_sk',
+            'origin_location_sk',
+            'destination_location_sk',
+            'co2_emission_kg',
+            'distance_km',
+        ],
+    )
@@ -29,6 +29,7 @@ from app.models import (
     FactForecast,
     FactShipment,
     FactInventorySnapshot,
+    date_to_key,
 )
 
 logger = structlog.get_logger()
@@ -97,8 +98,8 @@ async def export_sales(
     """
     Export sales data as CSV or JSON.
     """
-    start_key = int(start_date.strftime("%Y%m%d"))
-    end_key = int(end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(start_date)
+    end_key = date_to_key(end_date)
     
     query = (
         select(
@@ -191,8 +192,8 @@ async def export_forecast(
     """
     Export forecast data as CSV or JSON.
     """
-    start_key = int(start_date.strftime("%Y%m%d"))
-    end_key = int(end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(start_date)
+    end_key = date_to_key(end_date)
     
     query = (
         select(
@@ -274,8 +275,8 @@ async def generate_report(
     """
     report_id = f"RPT-{uuid.uuid4().hex[:8].upper()}"
     
-    start_key = int(request.start_date.strftime("%Y%m%d"))
-    end_key = int(request.end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(request.start_date)
+    end_key = date_to_key(request.end_date)
     
     sections = []
     
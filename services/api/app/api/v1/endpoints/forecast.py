@@ -25,6 +25,7 @@ from app.models import (
     FactSales,
     MLModel,
     MLModelAssignment,
+    date_to_key,
 )
 
 logger = structlog.get_logger()
@@ -171,8 +172,8 @@ async def get_forecast(
     assignment, model = assignment_row
     
     # Get forecast data
-    start_key = int(start_date.strftime("%Y%m%d"))
-    end_key = int(end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(start_date)
+    end_key = date_to_key(end_date)
     
     forecast_result = await session.execute(
         select(
@@ -249,8 +250,8 @@ async def get_forecast_accuracy(
     """
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
-    start_key = int(start_date.strftime("%Y%m%d"))
-    end_key = int(end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(start_date)
+    end_key = date_to_key(end_date)
     
     # This would be a complex query in production
     # Simplified version here
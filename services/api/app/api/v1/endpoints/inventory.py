@@ -5,9 +5,11 @@
 Inventory risk and stock analysis endpoints.
 """
 
+import asyncio
 from datetime import date, timedelta
 from typing import Annotated, Optional
 
+import numpy as np
 import structlog
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
@@ -15,13 +17,15 @@ from sqlalchemy import func, select, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import TokenPayload, require_viewer
-from app.db.mysql import get_session
+from app.db.mysql import get_session, get_session_context
 from app.models import (
     DimDate,
     DimProduct,
     DimLocation,
     FactInventorySnapshot,
     FactSales,
+    MvInventoryXY,
+    date_to_key,
 )
 
 logger = structlog.get_logger()
@@ -75,49 +79,32 @@ class HeatmapCell(BaseModel):
     label: str
 
 
+class InventoryDashboardResponse(BaseModel):
+    """Risk items, warehouse summaries and heatmap for one date."""
+    risk: InventoryRiskResponse
+    warehouses: list[WarehouseInventory]
+    heatmap: list[HeatmapCell]
+
+
 # =============================================================================
-# Endpoints
+# Helper Functions
 # =============================================================================
 
-@router.get("/risk", response_model=InventoryRiskResponse)
-async def get_inventory_risk(
-    current_user: Annotated[TokenPayload, Depends(require_viewer)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-    as_of_date: Optional[date] = Query(None),
-    region: Optional[str] = Query(None),
-    category: Optional[str] = Query(None),
-    min_risk: str = Query("low", description="Minimum risk level to include"),
-    limit: int = Query(50, ge=1, le=500),
-) -> InventoryRiskResponse:
-    """
-    Get inventory at-risk items sorted by risk level.
-    
-    Returns products with low days of supply or high stockout probability.
-    """
-    target_date = as_of_date or date.today()
-    date_key = int(target_date.strftime("%Y%m%d"))
-    
-    # Risk thresholds
-    risk_thresholds = {
-        "critical": (0, 3),    # 0-3 days
-        "high": (3, 7),        # 3-7 days
-        "medium": (7, 14),     # 7-14 days
-        "low": (14, 30),       # 14-30 days
-    }
-    
-    # Build query
+# Upper days-of-supply bound (inclusive) of each risk level but the last
+RISK_THRESHOLDS = np.array([3.0, 7.0, 14.0])
+RISK_LEVELS = ("critical", "high", "medium", "low")
+
+
+def filter_risk_rows(
+    query,
+    date_key: int,
+    region: Optional[str],
+    category: Optional[str],
+    min_risk: str,
+):
+    """Join the dimensions and apply the at-risk filters shared by items and summary."""
     query = (
-        select(
-            DimProduct.sku,
-            DimProduct.name,
-            DimProduct.category,
-            DimLocation.name.label("location_name"),
-            DimLocation.region,
-            FactInventorySnapshot.on_hand_units,
-            FactInventorySnapshot.at_risk_units,
-            FactInventorySnapshot.days_of_supply,
-            FactInventorySnapshot.stockout_probability,
-        )
+        query
         .join(DimProduct, FactInventorySnapshot.product_id == DimProduct.product_id)
         .join(DimLocation, FactInventorySnapshot.location_id == DimLocation.location_id)
         .where(FactInventorySnapshot.date_key == date_key)
@@ -136,28 +123,75 @@ async def get_inventory_risk(
     elif min_risk == "medium":
         query = query.where(FactInventorySnapshot.days_of_supply <= 14)
     
-    query = query.order_by(FactInventorySnapshot.days_of_supply.asc()).limit(limit)
+    return query
+
+
+def build_risk_query(
+    date_key: int,
+    region: Optional[str],
+    category: Optional[str],
+    min_risk: str,
+    limit: int,
+):
+    """Build the at-risk items query for one snapshot date."""
+    query = select(
+        DimProduct.sku,
+        DimProduct.name,
+        DimProduct.category,
+        DimLocation.name.label("location_name"),
+        DimLocation.region,
+        FactInventorySnapshot.on_hand_units,
+        FactInventorySnapshot.at_risk_units,
+        FactInventorySnapshot.days_of_supply,
+        FactInventorySnapshot.stockout_probability,
+    ).select_from(FactInventorySnapshot)
+    
+    query = filter_risk_rows(query, date_key, region, category, min_risk)
     
-    result = await session.execute(query)
+    return query.order_by(FactInventorySnapshot.days_of_supply.asc()).limit(limit)
+
+
+def build_risk_summary_query(
+    date_key: int,
+    region: Optional[str],
+    category: Optional[str],
+    min_risk: str,
+):
+    """
+    Build the risk summary query over every matching row, not just the top items.
     
-    items = []
-    risk_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+    Returns one row: the row count, the average days of supply and, for each
+    threshold, how many rows fall at or below it (missing days count as 0,
+    as in the item classification).
+    """
+    dos = func.coalesce(FactInventorySnapshot.days_of_supply, 0)
     
-    for row in result.all():
-        dos = float(row.days_of_supply or 0)
-        
-        if dos <= 3:
-            risk_level = "critical"
-        elif dos <= 7:
-            risk_level = "high"
-        elif dos <= 14:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
-        
-        risk_counts[risk_level] += 1
-        
-        items.append(InventoryRiskItem(
+    query = select(
+        func.count().label("total"),
+        func.avg(dos).label("avg_days_of_supply"),
+        *(
+            func.coalesce(func.sum(case((dos <= threshold, 1), else_=0)), 0).label(f"at_most_{level}")
+            for level, threshold in zip(RISK_LEVELS, RISK_THRESHOLDS.tolist())
+        ),
+    ).select_from(FactInventorySnapshot)
+    
+    return filter_risk_rows(query, date_key, region, category, min_risk)
+
+
+def build_risk_response(rows, summary_row, target_date: date) -> InventoryRiskResponse:
+    """Classify at-risk rows by days of supply and attach the SQL-side summary."""
+    # Classify the whole column at once: searchsorted maps each days_of_supply
+    # to its (lower, upper] threshold bucket
+    dos = np.fromiter(
+        (float(row.days_of_supply or 0) for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    buckets = np.searchsorted(RISK_THRESHOLDS, dos)
+    
+    # Rows come straight from typed columns, so skip per-item validation
+    items = [
+        InventoryRiskItem.model_construct(
             sku=row.sku,
             product_name=row.name,
             category=row.category,
@@ -165,35 +199,33 @@ async def get_inventory_risk(
             region=row.region,
             on_hand_units=row.on_hand_units,
             at_risk_units=row.at_risk_units,
-            days_of_supply=dos,
+            days_of_supply=days,
             stockout_probability=float(row.stockout_probability or 0),
-            risk_level=risk_level,
-        ))
+            risk_level=RISK_LEVELS[bucket],
+        )
+        for row, days, bucket in zip(rows, dos.tolist(), buckets.tolist())
+    ]
+    
+    # Cumulative "at most N days" counts become per-level counts
+    total = int(summary_row.total)
+    cumulative = [int(getattr(summary_row, f"at_most_{level}")) for level in RISK_LEVELS[:-1]]
+    cumulative.append(total)
+    risk_counts = dict(zip(RISK_LEVELS, np.diff(cumulative, prepend=0).tolist()))
     
     return InventoryRiskResponse(
         items=items,
         summary={
-            "total_items": len(items),
+            "total_items": total,
             "risk_distribution": risk_counts,
-            "avg_days_of_supply": sum(i.days_of_supply for i in items) / len(items) if items else 0,
+            "avg_days_of_supply": float(summary_row.avg_days_of_supply or 0),
         },
         as_of_date=target_date.isoformat(),
     )
 
 
-@router.get("/warehouses", response_model=list[WarehouseInventory])
-async def get_warehouse_inventory(
-    current_user: Annotated[TokenPayload, Depends(require_viewer)],
-    session: Annotated[AsyncSession, Depends(get_session)],
-    as_of_date: Optional[date] = Query(None),
-) -> list[WarehouseInventory]:
-    """
-    Get inventory summary by warehouse.
-    """
-    target_date = as_of_date or date.today()
-    date_key = int(target_date.strftime("%Y%m%d"))
-    
-    result = await session.execute(
+def build_warehouse_query(date_key: int):
+    """Build the per-warehouse inventory totals query for one snapshot date."""
+    return (
         select(
             DimLocation.location_id,
             DimLocation.name,
@@ -203,6 +235,7 @@ async def get_warehouse_inventory(
             func.sum(FactInventorySnapshot.on_hand_units).label("total_units"),
             func.sum(FactInventorySnapshot.on_hand_value).label("total_value"),
             func.sum(FactInventorySnapshot.at_risk_units).label("at_risk_units"),
+            func.sum(FactInventorySnapshot.at_risk_value).label("at_risk_value"),
         )
         .join(DimLocation, FactInventorySnapshot.location_id == DimLocation.location_id)
         .where(
@@ -217,26 +250,133 @@ async def get_warehouse_inventory(
         )
         .order_by(func.sum(FactInventorySnapshot.on_hand_value).desc())
     )
+
+
+def build_warehouse(row) -> WarehouseInventory:
+    """Turn one warehouse's totals into a summary with utilization."""
+    # SUM() comes back as Decimal; cast here since validation is skipped
+    total_units = int(row.total_units or 0)
+    at_risk_units = int(row.at_risk_units or 0)
+    capacity = row.capacity_units or total_units or 1
+    utilization = (total_units / capacity * 100) if capacity > 0 else 0
     
-    warehouses = []
-    for row in result.all():
-        total_units = row.total_units or 0
-        capacity = row.capacity_units or total_units or 1
-        utilization = (total_units / capacity * 100) if capacity > 0 else 0
-        
-        warehouses.append(WarehouseInventory(
-            location_id=row.location_id,
-            location_name=row.name,
-            region=row.region,
-            total_sku_count=row.sku_count,
-            total_units=total_units,
-            total_value=float(row.total_value or 0),
-            at_risk_units=row.at_risk_units or 0,
-            at_risk_value=float(row.at_risk_units or 0) * 10,  # Approx
-            utilization_pct=round(utilization, 1),
-        ))
+    return WarehouseInventory.model_construct(
+        location_id=row.location_id,
+        location_name=row.name,
+        region=row.region,
+        total_sku_count=row.sku_count,
+        total_units=total_units,
+        total_value=float(row.total_value or 0),
+        at_risk_units=at_risk_units,
+        at_risk_value=float(row.at_risk_value or 0),
+        utilization_pct=round(float(utilization), 1),
+    )
+
+
+def build_warehouses(rows) -> list[WarehouseInventory]:
+    """Turn per-warehouse totals into summaries with utilization."""
+    return [build_warehouse(row) for row in rows]
+
+
+def build_heatmap_query(date_key: int, x_axis: str, y_axis: str, metric: str):
+    """
+    Build the risk heatmap aggregation query for one snapshot date.
+    
+    Reads the pre-joined mv_inventory_xy summary rather than joining the
+    snapshot to both dimensions on every request.
+    """
+    # Determine grouping columns
+    x_col = MvInventoryXY.region if x_axis == "region" else MvInventoryXY.category
+    y_col = MvInventoryXY.category if y_axis == "category" else MvInventoryXY.region
+    
+    if metric == "at_risk_units":
+        agg_col = func.sum(MvInventoryXY.at_risk_units)
+    else:
+        # Weighted by row count, so it equals AVG() over the underlying snapshot
+        agg_col = func.sum(MvInventoryXY.days_of_supply_sum) / func.nullif(
+            func.sum(MvInventoryXY.days_of_supply_count), 0
+        )
+    
+    return (
+        select(
+            x_col.label("x"),
+            y_col.label("y"),
+            agg_col.label("value"),
+        )
+        .where(MvInventoryXY.date_key == date_key)
+        .group_by(x_col, y_col)
+    )
+
+
+def build_heatmap_cell(row) -> HeatmapCell:
+    """Turn one heatmap aggregate into a labelled cell."""
+    return HeatmapCell.model_construct(
+        x=row.x,
+        y=row.y,
+        value=float(row.value or 0),
+        label=f"{row.value:.1f}",
+    )
+
+
+def build_heatmap_cells(rows) -> list[HeatmapCell]:
+    """Turn heatmap aggregates into labelled cells."""
+    return [build_heatmap_cell(row) for row in rows]
+
+
+async def fetch_rows(query) -> list:
+    """Run a query on its own session so it can overlap with others."""
+    async with get_session_context() as session:
+        result = await session.execute(query)
+        return result.all()
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+@router.get("/risk", response_model=InventoryRiskResponse)
+async def get_inventory_risk(
+    current_user: Annotated[TokenPayload, Depends(require_viewer)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    as_of_date: Optional[date] = Query(None),
+    region: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    min_risk: str = Query("low", description="Minimum risk level to include"),
+    limit: int = Query(50, ge=1, le=500),
+) -> InventoryRiskResponse:
+    """
+    Get inventory at-risk items sorted by risk level.
+    
+    Returns products with low days of supply or high stockout probability.
+    """
+    target_date = as_of_date or date.today()
+    date_key = date_to_key(target_date)
+    
+    # The summary covers every matching row, so it runs as its own query
+    # alongside the limited item query
+    result, summary_rows = await asyncio.gather(
+        session.execute(build_risk_query(date_key, region, category, min_risk, limit)),
+        fetch_rows(build_risk_summary_query(date_key, region, category, min_risk)),
+    )
     
-    return warehouses
+    return build_risk_response(result.all(), summary_rows[0], target_date)
+
+
+@router.get("/warehouses", response_model=list[WarehouseInventory])
+async def get_warehouse_inventory(
+    current_user: Annotated[TokenPayload, Depends(require_viewer)],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    as_of_date: Optional[date] = Query(None),
+) -> list[WarehouseInventory]:
+    """
+    Get inventory summary by warehouse.
+    """
+    target_date = as_of_date or date.today()
+    date_key = date_to_key(target_date)
+    
+    result = await session.execute(build_warehouse_query(date_key))
+    
+    return build_warehouses(result.all())
 
 
 @router.get("/heatmap", response_model=list[HeatmapCell])
@@ -252,36 +392,46 @@ async def get_risk_heatmap(
     Get heatmap data for inventory risk visualization.
     """
     target_date = as_of_date or date.today()
-    date_key = int(target_date.strftime("%Y%m%d"))
+    date_key = date_to_key(target_date)
     
-    # Determine grouping columns
-    x_col = DimLocation.region if x_axis == "region" else DimProduct.category
-    y_col = DimProduct.category if y_axis == "category" else DimLocation.region
+    # Stream with a server-side cursor so cells are built while rows are
+    # still arriving, without buffering the full result first
+    query = build_heatmap_query(date_key, x_axis, y_axis, metric).execution_options(yield_per=500)
+    result = await session.stream(query)
     
-    if metric == "at_risk_units":
-        agg_col = func.sum(FactInventorySnapshot.at_risk_units)
-    else:
-        agg_col = func.avg(FactInventorySnapshot.days_of_supply)
+    return [build_heatmap_cell(row) async for row in result]
+
+
+@router.get("/dashboard", response_model=InventoryDashboardResponse)
+async def get_inventory_dashboard(
+    current_user: Annotated[TokenPayload, Depends(require_viewer)],
+    as_of_date: Optional[date] = Query(None),
+    region: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    min_risk: str = Query("low", description="Minimum risk level to include"),
+    limit: int = Query(50, ge=1, le=500),
+    x_axis: str = Query("region", description="Heatmap X-axis: region or category"),
+    y_axis: str = Query("category", description="Heatmap Y-axis: region or category"),
+    metric: str = Query("at_risk_units", description="Heatmap metric: at_risk_units or days_of_supply"),
+) -> InventoryDashboardResponse:
+    """
+    Get risk items, warehouse summaries and the risk heatmap in one call.
     
-    result = await session.execute(
-        select(
-            x_col.label("x"),
-            y_col.label("y"),
-            agg_col.label("value"),
-        )
-        .join(DimProduct, FactInventorySnapshot.product_id == DimProduct.product_id)
-        .join(DimLocation, FactInventorySnapshot.location_id == DimLocation.location_id)
-        .where(FactInventorySnapshot.date_key == date_key)
-        .group_by(x_col, y_col)
-    )
+    The queries run concurrently on separate pooled connections, so the
+    response takes as long as the slowest query rather than their sum.
+    """
+    target_date = as_of_date or date.today()
+    date_key = date_to_key(target_date)
     
-    cells = []
-    for row in result.all():
-        cells.append(HeatmapCell(
-            x=row.x,
-            y=row.y,
-            value=float(row.value or 0),
-            label=f"{row.value:.1f}",
-        ))
+    risk_rows, summary_rows, warehouse_rows, heatmap_rows = await asyncio.gather(
+        fetch_rows(build_risk_query(date_key, region, category, min_risk, limit)),
+        fetch_rows(build_risk_summary_query(date_key, region, category, min_risk)),
+        fetch_rows(build_warehouse_query(date_key)),
+        fetch_rows(build_heatmap_query(date_key, x_axis, y_axis, metric)),
+    )
     
-    return cells
+    return InventoryDashboardResponse(
+        risk=build_risk_response(risk_rows, summary_rows[0], target_date),
+        warehouses=build_warehouses(warehouse_rows),
+        heatmap=build_heatmap_cells(heatmap_rows),
+    )
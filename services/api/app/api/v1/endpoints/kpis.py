@@ -25,6 +25,7 @@ from app.models import (
     FactInventorySnapshot,
     FactShipment,
     FactForecast,
+    date_to_key,
 )
 
 logger = structlog.get_logger()
@@ -118,9 +119,9 @@ async def get_kpi_overview(
         return OverviewKPIs(**cached)
     
     # Get date keys
-    date_key = int(target_date.strftime("%Y%m%d"))
+    date_key = date_to_key(target_date)
     prev_date = target_date - timedelta(days=7)
-    prev_date_key = int(prev_date.strftime("%Y%m%d"))
+    prev_date_key = date_to_key(prev_date)
     
     # Calculate fill rate (units shipped / units ordered)
     fill_rate_result = await session.execute(
@@ -241,11 +242,10 @@ async def get_kpi_overview(
     )
     active_shipments = active_result.scalar() or 0
     
-    # At-risk inventory value
+    # At-risk inventory value, priced at load time
     risk_result = await session.execute(
-        select(func.sum(FactInventorySnapshot.at_risk_units * 10)).where(  # Approx unit value
+        select(func.sum(FactInventorySnapshot.at_risk_value)).where(
             FactInventorySnapshot.date_key == date_key,
-            FactInventorySnapshot.at_risk_units > 0,
         )
     )
     at_risk_value = float(risk_result.scalar() or 0)
@@ -283,8 +283,8 @@ async def get_kpi_trend(
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    start_key = int(start_date.strftime("%Y%m%d"))
-    end_key = int(end_date.strftime("%Y%m%d"))
+    start_key = date_to_key(start_date)
+    end_key = date_to_key(end_date)
     
     data_points: list[TrendDataPoint] = []
     
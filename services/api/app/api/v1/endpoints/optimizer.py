@@ -21,7 +21,7 @@ from app.core.config import settings
 from app.core.security import TokenPayload, require_analyst
 from app.db.mysql import get_session
 from app.db.redis import cache_get, cache_set, route_plan_cache_key
-from app.models import DimLocation, DimCarrier, FactRoutePlan
+from app.models import DimLocation, DimCarrier, FactRoutePlan, date_to_key
 
 logger = structlog.get_logger()
 
@@ -255,7 +255,7 @@ async def create_route_plan(
     )
     
     # Persist route plan
-    date_key = int(request.plan_date.strftime("%Y%m%d"))
+    date_key = date_to_key(request.plan_date)
     route_plan = FactRoutePlan(
         plan_id=plan_id,
         date_key=date_key,
@@ -62,6 +62,8 @@ class Settings(BaseSettings):
     MYSQL_DATABASE: str = Field(default="indigoglass")
     MYSQL_USER: str = Field(default="indigoglass")
     MYSQL_PASSWORD: str = Field(default="password")
+    MYSQL_POOL_SIZE: int = Field(default=25)
+    MYSQL_MAX_OVERFLOW: int = Field(default=25)
     
     @property
     def MYSQL_URL(self) -> str:
@@ -7,12 +7,13 @@ Request ID, timing, and rate limiting middlewares.
 
 import time
 import uuid
-from typing import Callable
+from typing import Optional
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Response
 from prometheus_client import Counter, Histogram
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
@@ -32,76 +33,149 @@ REQUEST_LATENCY = Histogram(
     buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 )
 
+# Resolved metric children per (method, endpoint, status), so the hot path
+# skips prometheus_client's label validation and locked lookup. Bounded
+# because unmatched requests still fall back to their raw path.
+METRIC_CHILD_CACHE_MAX_SIZE = 4096
+_metric_children: dict[tuple[str, str, int], tuple] = {}
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
+
+def _request_metrics(method: str, endpoint: str, status: int) -> tuple:
+    """Return the (count, latency) metric children for a request."""
+    key = (method, endpoint, status)
+    children = _metric_children.get(key)
+    if children is None:
+        children = (
+            REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status),
+            REQUEST_LATENCY.labels(method=method, endpoint=endpoint),
+        )
+        if len(_metric_children) < METRIC_CHILD_CACHE_MAX_SIZE:
+            _metric_children[key] = children
+    return children
+
+
+# Increment a rate-limit counter and start its window on the first hit, in
+# one round-trip; atomic, so a counter can never be left without a TTL
+RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    """First value of a request header; ASGI header names are lower-case."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+# Plain ASGI middlewares: unlike BaseHTTPMiddleware they add no extra task
+# or Request/Response objects per request, and contextvars bound here are
+# visible to the endpoint
+class RequestIdMiddleware:
     """Add unique request ID to each request for tracing."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_id = _header(scope, b"x-request-id") or str(uuid.uuid4())
         
         # Add to structlog context
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(request_id=request_id)
         
-        # Store in request state
-        request.state.request_id = request_id
+        # Store in request state (read back as request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
         
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_request_id)
 
 
-class TimingMiddleware(BaseHTTPMiddleware):
+class TimingMiddleware:
     """Track request timing and log structured request info."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.perf_counter()
-        
-        response = await call_next(request)
-        
-        duration = time.perf_counter() - start_time
-        duration_ms = round(duration * 1000, 2)
-        
-        # Update Prometheus metrics
-        endpoint = request.url.path
-        method = request.method
-        status = response.status_code
-        
-        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status).inc()
-        REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Add timing header
-        response.headers["X-Response-Time"] = f"{duration_ms}ms"
+        start_ns = time.perf_counter_ns()
+        status = 500
         
-        # Log request (skip health checks)
-        if not endpoint.startswith("/health"):
-            logger.info(
-                "http_request",
-                method=method,
-                path=endpoint,
-                status=status,
-                latency_ms=duration_ms,
-                user_agent=request.headers.get("User-Agent", "unknown"),
-            )
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Time to first byte: the header has to go out before the body
+                duration_ms = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+                MutableHeaders(scope=message)["X-Response-Time"] = f"{duration_ms}ms"
+            await send(message)
         
-        return response
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            duration = duration_ns / 1_000_000_000
+            duration_ms = round(duration_ns / 1_000_000, 2)
+            
+            # Update Prometheus metrics, labelled by route template (e.g.
+            # /api/v1/kpis/trends/{metric}) so path parameters don't add series
+            endpoint = scope["path"]
+            route = scope.get("route")
+            route_path = route.path if route is not None else endpoint
+            method = scope["method"]
+            
+            request_count, request_latency = _request_metrics(method, route_path, status)
+            request_count.inc()
+            request_latency.observe(duration)
+            
+            # Log request (skip health checks)
+            if not endpoint.startswith("/health"):
+                logger.info(
+                    "http_request",
+                    method=method,
+                    path=endpoint,
+                    status=status,
+                    latency_ms=duration_ms,
+                    user_agent=_header(scope, b"user-agent") or "unknown",
+                )
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Simple rate limiting using Redis.
     Rate limits are tracked per IP address.
     """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip rate limiting for health checks
-        if request.url.path.startswith("/health"):
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"].startswith("/health"):
+            await self.app(scope, receive, send)
+            return
         
         # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-        forwarded = request.headers.get("X-Forwarded-For")
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        forwarded = _header(scope, b"x-forwarded-for")
         if forwarded:
             client_ip = forwarded.split(",")[0].strip()
         
@@ -111,10 +185,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             redis = await get_redis()
             if redis:
                 key = f"ratelimit:{client_ip}"
-                current = await redis.incr(key)
-                
-                if current == 1:
-                    await redis.expire(key, 60)  # 1 minute window
+                current = await redis.eval(RATE_LIMIT_SCRIPT, 1, key, 60)  # 1 minute window
                 
                 if current > settings.RATE_LIMIT_PER_MINUTE:
                     logger.warning(
@@ -122,14 +193,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         client_ip=client_ip,
                         requests=current,
                     )
-                    return Response(
+                    response = Response(
                         content='{"error": "Rate limit exceeded"}',
                         status_code=429,
                         media_type="application/json",
                         headers={"Retry-After": "60"},
                     )
+                    await response(scope, receive, send)
+                    return
         except Exception as e:
             # Log but don't block on rate limit errors
             logger.warning("rate_limit_error", error=str(e))
         
-        return await call_next(request)
+        await self.app(scope, receive, send)
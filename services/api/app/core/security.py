@@ -5,23 +5,30 @@
 JWT-based authentication with RBAC support.
 """
 
+import hashlib
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Annotated, Optional
 
+import bcrypt
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
 
 from app.core.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing cost, passlib's bcrypt default; existing hashes keep their own
+BCRYPT_ROUNDS = 12
 
-# JWT bearer scheme
-security = HTTPBearer()
+# JWT bearer scheme; missing credentials are rejected in get_current_user so
+# they get the same 401 as an invalid token rather than HTTPBearer's 403
+security = HTTPBearer(auto_error=False)
+
+# Verified token payloads keyed by SHA-256 of the token, so raw JWTs are not
+# kept in memory; entries are served until the token's own exp
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: dict[bytes, "TokenPayload"] = {}
 
 
 class Role(str, Enum):
@@ -51,12 +58,12 @@ class TokenResponse(BaseModel):
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
 def create_access_token(
@@ -114,14 +121,22 @@ def create_tokens(user_id: str, email: str, role: Role) -> TokenResponse:
 
 
 def decode_token(token: str) -> TokenPayload:
-    """Decode and validate a JWT token."""
+    """Decode and validate a JWT token, reusing earlier verifications of the same token."""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        if cached.exp > datetime.now(timezone.utc):
+            return cached
+        # Expired: drop it and let jwt.decode raise the usual 401
+        _token_cache.pop(cache_key, None)
+    
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        return TokenPayload(
+        token_payload = TokenPayload(
             sub=payload["sub"],
             email=payload["email"],
             role=Role(payload["role"]),
@@ -129,18 +144,32 @@ def decode_token(token: str) -> TokenPayload:
             iat=datetime.fromtimestamp(payload["iat"], tz=timezone.utc),
             type=payload["type"],
         )
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
+    
+    if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[cache_key] = token_payload
+    
+    return token_payload
 
 
 async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(security)]
 ) -> TokenPayload:
     """Dependency to get the current authenticated user."""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     token = credentials.credentials
     payload = decode_token(token)
     
@@ -5,11 +5,13 @@
 Async MySQL connection using SQLAlchemy 2.x with asyncmy driver.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
 import structlog
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
@@ -36,13 +38,16 @@ async def init_mysql() -> None:
     """Initialize MySQL connection pool."""
     global _engine, _session_maker
     
+    # LIFO checkout keeps reusing the most recently returned connections, so
+    # idle ones beyond the working set age out via pool_recycle
     _engine = create_async_engine(
         settings.MYSQL_URL,
         echo=settings.DEBUG,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=settings.MYSQL_POOL_SIZE,
+        max_overflow=settings.MYSQL_MAX_OVERFLOW,
         pool_pre_ping=True,
-        pool_recycle=3600,
+        pool_recycle=1800,
+        pool_use_lifo=True,
     )
     
     _session_maker = async_sessionmaker(
@@ -53,9 +58,35 @@ async def init_mysql() -> None:
         autoflush=False,
     )
     
+    await _warm_pool(_engine, settings.MYSQL_POOL_SIZE)
+    
     logger.info("mysql_initialized", host=settings.MYSQL_HOST, database=settings.MYSQL_DATABASE)
 
 
+async def _warm_pool(engine: AsyncEngine, size: int) -> None:
+    """Open the pool's connections up front so early requests skip connection setup."""
+    # Held open together so the pool creates `size` distinct connections;
+    # every one that did open is returned even if others failed
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)),
+        return_exceptions=True,
+    )
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for conn in results:
+        if isinstance(conn, AsyncConnection):
+            await conn.close()
+    
+    if errors:
+        # Not fatal: the pool still connects lazily once MySQL is reachable
+        logger.warning(
+            "mysql_pool_warmup_failed",
+            failed=len(errors),
+            size=size,
+            error=str(errors[0]),
+        )
+
+
 async def close_mysql() -> None:
     """Close MySQL connection pool."""
     global _engine, _session_maker
@@ -154,6 +154,11 @@ def route_plan_cache_key(plan_id: str) -> str:
     return f"route:plan:{plan_id}"
 
 
+def emissions_cache_key(endpoint: str, *params: Any) -> str:
+    """Generate cache key for a sustainability endpoint and its parameters."""
+    return ":".join(["emissions", endpoint, *(str(p) for p in params)])
+
+
 # =============================================================================
 # Distributed Lock
 # =============================================================================
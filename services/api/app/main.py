@@ -6,11 +6,14 @@ Main entry point for the IndigoGlass Nexus API service.
 Provides REST endpoints for forecasting, optimization, and analytics.
 """
 
-from contextlib import asynccontextmanager
-from typing import AsyncIterator
+import asyncio
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional
 
+import orjson
 import structlog
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 from prometheus_client import make_asgi_app
@@ -30,6 +33,73 @@ from app.db.redis import init_redis, close_redis
 
 logger = structlog.get_logger()
 
+# Per-dependency budget for /health/ready, inside a typical 1s probe timeout
+HEALTH_CHECK_TIMEOUT_SECONDS = 0.5
+
+# Readiness is refreshed in the background and probes read the last result;
+# a result older than the max age (refresher stalled) is re-checked inline
+READINESS_REFRESH_SECONDS = 2.0
+READINESS_MAX_AGE_SECONDS = 5.0
+_readiness: Optional[tuple[float, dict]] = None
+
+# Constant probe bodies, serialised once instead of on every scrape
+HEALTHY_BODY = orjson.dumps({"status": "healthy", "service": "indigoglass-api"})
+ALIVE_BODY = orjson.dumps({"status": "alive"})
+
+
+# =============================================================================
+# Readiness
+# =============================================================================
+
+async def check_readiness() -> dict:
+    """Check every dependency concurrently and remember the result."""
+    global _readiness
+    
+    from app.db.mysql import check_mysql_health
+    from app.db.mongodb import check_mongodb_health
+    from app.db.neo4j import check_neo4j_health
+    from app.db.redis import check_redis_health
+    
+    checks = {
+        "mysql": check_mysql_health,
+        "mongodb": check_mongodb_health,
+        "neo4j": check_neo4j_health,
+        "redis": check_redis_health,
+    }
+    
+    # Probe concurrently so one slow backend costs its timeout, not the sum
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(check(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
+            for check in checks.values()
+        ),
+        return_exceptions=True,
+    )
+    # Timeouts and errors come back as exceptions and count as unhealthy
+    health_status = {name: result is True for name, result in zip(checks, results)}
+    
+    all_healthy = all(health_status.values())
+    
+    readiness = {
+        "status": "ready" if all_healthy else "degraded",
+        "dependencies": health_status,
+    }
+    _readiness = (time.monotonic(), readiness)
+    
+    return readiness
+
+
+async def refresh_readiness() -> None:
+    """Keep the readiness result fresh so probes never wait on the backends."""
+    while True:
+        await check_readiness()
+        await asyncio.sleep(READINESS_REFRESH_SECONDS)
+
+
+# =============================================================================
+# Application
+# =============================================================================
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
@@ -48,10 +118,15 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     
     logger.info("all_connections_established")
     
+    readiness_task = asyncio.create_task(refresh_readiness())
+    
     yield
     
     # Shutdown
     logger.info("shutting_down_application")
+    readiness_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await readiness_task
     await close_redis()
     await close_neo4j()
     await close_mongodb()
@@ -105,38 +180,26 @@ app = create_application()
 # =============================================================================
 
 @app.get("/health", tags=["Health"])
-async def health_check() -> dict:
+async def health_check() -> Response:
     """Basic health check endpoint."""
-    return {"status": "healthy", "service": "indigoglass-api"}
+    return Response(content=HEALTHY_BODY, media_type="application/json")
 
 
 @app.get("/health/ready", tags=["Health"])
 async def readiness_check() -> dict:
     """
-    Readiness probe - checks all dependencies.
+    Readiness probe - reports the latest check of all dependencies.
     Returns 503 if any dependency is unhealthy.
     """
-    from app.db.mysql import check_mysql_health
-    from app.db.mongodb import check_mongodb_health
-    from app.db.neo4j import check_neo4j_health
-    from app.db.redis import check_redis_health
-    
-    health_status = {
-        "mysql": await check_mysql_health(),
-        "mongodb": await check_mongodb_health(),
-        "neo4j": await check_neo4j_health(),
-        "redis": await check_redis_health(),
-    }
+    if _readiness is not None:
+        checked_at, readiness = _readiness
+        if time.monotonic() - checked_at < READINESS_MAX_AGE_SECONDS:
+            return readiness
     
-    all_healthy = all(health_status.values())
-    
-    return {
-        "status": "ready" if all_healthy else "degraded",
-        "dependencies": health_status,
-    }
+    return await check_readiness()
 
 
 @app.get("/health/live", tags=["Health"])
-async def liveness_check() -> dict:
+async def liveness_check() -> Response:
     """Liveness probe - basic application check."""
-    return {"status": "alive"}
+    return Response(content=ALIVE_BODY, media_type="application/json")
@@ -51,6 +51,16 @@ class DimDate(Base):
     is_holiday: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
 
+def date_to_key(d: date) -> int:
+    """dim_date key (YYYYMMDD as an integer) for a date."""
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def key_to_date(date_key: int) -> date:
+    """Date for a dim_date key; the inverse of date_to_key."""
+    return date(date_key // 10000, date_key // 100 % 100, date_key % 100)
+
+
 class DimProduct(Base):
     """Product dimension for SKU master data."""
     __tablename__ = "dim_product"
@@ -154,6 +164,7 @@ class FactInventorySnapshot(Base):
     on_hand_value: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False)
     reserved_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     at_risk_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    at_risk_value: Mapped[Decimal] = mapped_column(Numeric(15, 2), nullable=False, default=0)
     days_of_supply: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2))
     stockout_probability: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 4))
 
@@ -162,7 +173,15 @@ class FactShipment(Base):
     """Shipment fact table for logistics tracking."""
     __tablename__ = "fact_shipment"
     __table_args__ = (
-        Index("idx_shipment_date", "date_key"),
+        # Covers a date-range emissions rollup over this model's columns
+        # (mode via carrier, units summed). The migrated fact_shipment names
+        # its columns differently; its index of the same name is built in
+        # migration 013 over the columns the agg_emissions_daily refresh reads.
+        Index(
+            "ix_fact_shipment_date_emissions",
+            "date_key", "carrier_id", "from_location_id", "to_location_id",
+            "co2_kg", "units", "distance_km",
+        ),
         Index("idx_shipment_status", "status"),
     )
     
@@ -234,6 +253,43 @@ class FactRoutePlan(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
 
+# =============================================================================
+# Summary Tables
+# =============================================================================
+
+class MvInventoryXY(Base):
+    """Inventory risk pre-aggregated by date, region and category (heatmap source)."""
+    __tablename__ = "mv_inventory_xy"
+    
+    date_key: Mapped[int] = mapped_column(Integer, primary_key=True)
+    region: Mapped[str] = mapped_column(String(100), primary_key=True)
+    category: Mapped[str] = mapped_column(String(100), primary_key=True)
+    at_risk_units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Sum and count rather than AVG, so averages can be re-aggregated exactly
+    days_of_supply_sum: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 2))
+    days_of_supply_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class AggEmissionsDaily(Base):
+    """Shipment emissions pre-aggregated by day, mode, destination region and route."""
+    __tablename__ = "agg_emissions_daily"
+    __table_args__ = (
+        Index("ix_agg_emissions_daily_date_key", "date_key"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    date_key: Mapped[int] = mapped_column(Integer, nullable=False)
+    # NULL when the shipment's carrier or location has no dimension row
+    mode: Mapped[Optional[str]] = mapped_column(String(20))
+    region: Mapped[Optional[str]] = mapped_column(String(100))
+    from_name: Mapped[Optional[str]] = mapped_column(String(200))
+    to_name: Mapped[Optional[str]] = mapped_column(String(200))
+    shipments: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_co2_kg: Mapped[Decimal] = mapped_column(Numeric(18, 4), nullable=False)
+    total_units: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_distance_km: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+
+
 # =============================================================================
 # ML Model Registry Tables
 # =============================================================================